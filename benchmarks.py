@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmarks for rockefeller hot paths.
+
+Run all of them with ``python benchmarks.py`` or just some of them with
+``python benchmarks.py round_amount ...``.
+"""
+import decimal
+import sys
+import time
+import timeit
+
+import rockefeller
+
+BENCHMARKS = {}
+
+usd = rockefeller.Currency(name='United States Dollar', code='USD',
+                           numeric=840, symbol=u'$', exponent=2)
+clp = rockefeller.Currency(name='Chilean Peso', code='CLP', numeric=152,
+                           symbol=u'$', exponent=0)
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__[len('bench_'):]] = func
+    return func
+
+
+def report(name, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    print('{:<45} {:>10.3f} us/call'.format(name, seconds / number * 1e6))
+
+
+def _uncached_round_amount(amount, currency):
+    exponent = '1.' + '0' * currency.exponent
+    return amount.quantize(decimal.Decimal(exponent),
+                           rounding=decimal.ROUND_HALF_UP)
+
+
+@benchmark
+def bench_round_amount(number=200000):
+    amount = decimal.Decimal('60551.984324')
+    for currency in (usd, clp):
+        report('round_amount uncached ({})'.format(currency),
+               lambda: _uncached_round_amount(amount, currency), number)
+        report('round_amount ({})'.format(currency),
+               lambda: rockefeller.round_amount(amount, currency), number)
+
+
+@benchmark
+def bench_sum(number=20, size=10000):
+    moneys = [rockefeller.Money(decimal.Decimal(i) / 100, usd)
+              for i in range(size)]
+    fixed = [rockefeller.FixedMoney.from_money(money) for money in moneys]
+
+    def total(values):
+        result = values[0]
+        for value in values[1:]:
+            result = result + value
+        return result
+
+    report('sum of {} Money'.format(size), lambda: total(moneys), number)
+    report('sum of {} FixedMoney'.format(size), lambda: total(fixed), number)
+    report('sum_money of {} Money'.format(size),
+           lambda: rockefeller.sum_money(moneys), number)
+    report('sum_money of {} FixedMoney'.format(size),
+           lambda: rockefeller.sum_money(fixed), number)
+
+
+class _RemoteCurrency(rockefeller.MemoryCurrency):
+    """Memory store simulating the round trip of a remote store."""
+    __slots__ = ()
+
+    def get(self, code):
+        time.sleep(0.0001)
+        return super(_RemoteCurrency, self).get(code)
+
+
+@benchmark
+def bench_currency_attribute(number=2000):
+    store = _RemoteCurrency()
+    store.support(usd)
+    with rockefeller.using_currencies(store):
+        report('Currency.get remote store',
+               lambda: rockefeller.Currency.get('USD'), number)
+        report('Currency.USD remote store',
+               lambda: rockefeller.Currency.USD, number)
+
+
+@benchmark
+def bench_currency_equality(number=20, size=2000):
+    codes = [(usd, 840), (clp, 152)] + [
+        (usd._replace(code='X{:02d}'.format(i), numeric=900 + i), 900 + i)
+        for i in range(8)]
+    # Stores building a currency per lookup return equal but distinct
+    # objects unless they intern them.
+    copies = [rockefeller.Money(i % 7, rockefeller.Currency(*currency))
+              for i, (currency, _) in enumerate(codes * (size // len(codes)))]
+    interned = [rockefeller.Money(money.amount,
+                                  rockefeller.intern_currency(money.currency))
+                for money in copies]
+
+    def dedupe(moneys):
+        unique = []
+        for money in moneys:
+            if money not in unique:
+                unique.append(money)
+        return unique
+
+    def group(moneys):
+        groups = {}
+        for money in moneys:
+            groups.setdefault(money.currency, []).append(money)
+        return groups
+
+    for name, moneys in (('copies', copies), ('interned', interned)):
+        report('dedupe {} Money ({})'.format(size, name),
+               lambda: dedupe(moneys), number)
+        report('group {} Money ({})'.format(size, name),
+               lambda: group(moneys), number * 10)
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or sorted(BENCHMARKS):
+        print(name)
+        BENCHMARKS[name]()
@@ -1,10 +1,18 @@
 # -*- coding: utf-8 -*-
 from .exchange_rates import (ExchangeRate, ExchangeRates, MemoryExchangeRates,
-                             exchange_rates, add_exchange_rate,
-                             remove_exchange_rate, get_exchange_rate)
-from .currency import Currency, MemoryCurrency
-from .money import Money, round_amount
+                             CopyOnWriteExchangeRates, GraphExchangeRates,
+                             RateMatrix, CachedExchangeRates, exchange_rates,
+                             add_exchange_rate, remove_exchange_rate,
+                             get_exchange_rate, using_rates)
+from .currency import (Currency, MemoryCurrency, CopyOnWriteCurrency,
+                       using_currencies, intern_currency)
+from .money import (Money, FixedMoney, round_amount, exchange_many,
+                    sum_money, totals_by_currency, total_in, allocate,
+                    split)
+from .arrays import MoneyArray, allocate_many, split_many
 from .exceptions import ExchangeError, MoneyError
+from .utils import (get_decimal_context, set_decimal_context,
+                    reset_decimal_context)
 
 
 def set_currency_store(store):
@@ -17,7 +25,14 @@ def set_exchange_rates_store(store):
 
 __all__ = ['add_exchange_rate', 'get_exchange_rate', 'Currency', 'Money',
            'ExchangeRates', 'MemoryExchangeRates', 'MemoryCurrency',
-           'set_currency_store', 'set_exchange_rates_store', 'round_amount']
+           'set_currency_store', 'set_exchange_rates_store', 'round_amount',
+           'MoneyArray', 'exchange_many', 'FixedMoney', 'GraphExchangeRates',
+           'RateMatrix', 'CachedExchangeRates', 'CopyOnWriteCurrency',
+           'CopyOnWriteExchangeRates', 'using_rates', 'using_currencies',
+           'intern_currency', 'sum_money', 'totals_by_currency', 'total_in',
+           'allocate', 'split', 'allocate_many', 'split_many',
+           'get_decimal_context', 'set_decimal_context',
+           'reset_decimal_context']
 
 __title__ = 'rockefeller'
 __version__ = '1.2.0'
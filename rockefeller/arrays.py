@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+import operator
+from array import array
+
+from six import integer_types
+
+from .exceptions import MoneyError
+from .money import (Money, to_decimal, to_units, from_units, get_places,
+                    _get_ratios, _get_parts, _allocate_units)
+
+try:
+    array('q')
+    TYPECODE = 'q'
+except ValueError:
+    TYPECODE = 'l'
+
+
+def _check_operand(operation, operand):
+    if not isinstance(operand, (MoneyArray, Money)):
+        msg = "unsupported operand type(s) for %s: 'MoneyArray' and '%r'" % (
+            operation, operand.__class__)
+        raise TypeError(msg)
+
+
+def _to_array(units):
+    """Store units as signed 64 bit integers.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if any of them
+        doesn't fit.
+    """
+    try:
+        return array(TYPECODE, units)
+    except OverflowError:
+        raise MoneyError('Amounts exceed the range of MoneyArray units.')
+
+
+def _rescale(units, exponent, to_exponent):
+    """Rescale units to a greater or equal exponent."""
+    if to_exponent == exponent:
+        return units
+    factor = 10 ** (to_exponent - exponent)
+    return _to_array(unit * factor for unit in units)
+
+
+class MoneyArray(object):
+    """Sequence of amounts of money sharing the same currency.
+
+    Amounts are stored as signed 64 bit integers counting units of
+    ``10 ** -exponent`` so arithmetic is done with plain integers instead of
+    building a :class:`~rockefeller.money.Money` object per step.
+
+    Initialization params:
+
+        `units`
+            Iterable of integer amounts scaled by ``10 ** exponent``.
+
+        `currency`
+            Currency of every amount. :class:`~rockefeller.currency.Currency`
+            instance.
+
+        `exponent`
+            Number of digits after the decimal separator of the stored units.
+            Defaults to the currency exponent.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if any of the units
+        doesn't fit in 64 bits.
+    """
+    __slots__ = ('units', 'currency', 'exponent')
+
+    def __init__(self, units, currency, exponent=None):
+        if exponent is None:
+            try:
+                exponent = currency.exponent
+            except AttributeError:
+                raise MoneyError(
+                    'Wrong currency `{!r}` for money.'.format(currency))
+        self.units = _to_array(units)
+        self.currency = currency
+        self.exponent = exponent
+
+    @classmethod
+    def from_moneys(cls, moneys, currency=None):
+        """Build an array from :class:`~rockefeller.money.Money` objects.
+
+        The exponent of the array is big enough to store every amount
+        without loss.
+
+        :param moneys: Iterable of :class:`~rockefeller.money.Money` objects.
+        :param currency: Currency of the array, required if ``moneys`` is
+            empty. :class:`~rockefeller.currency.Currency` instance.
+
+        :return: :class:`~rockefeller.arrays.MoneyArray` instance.
+
+        :raises: :class:`~rockefeller.exceptions.MoneyError` if moneys have
+            different currencies.
+        """
+        moneys = list(moneys)
+        if currency is None:
+            if not moneys:
+                raise MoneyError('Currency required for an empty MoneyArray.')
+            currency = moneys[0].currency
+        exponent = currency.exponent
+        for money in moneys:
+            if money.currency != currency:
+                raise MoneyError('Money `{}` is not in {}.'.format(
+                    money, currency))
+            exponent = max(exponent, get_places(money.amount))
+        units = (to_units(money.amount, exponent) for money in moneys)
+        return cls(units, currency, exponent)
+
+    def to_moneys(self):
+        """Convert the array into a list of
+        :class:`~rockefeller.money.Money` objects.
+        """
+        return list(self)
+
+    def _new(self, units, exponent=None):
+        if exponent is None:
+            exponent = self.exponent
+        return self.__class__(units, self.currency, exponent)
+
+    def _align(self, operation, other):
+        """Get the units of ``self`` and ``other`` using the same exponent.
+
+        :return: ``(units, other_units, exponent)`` tuple. ``other_units`` is
+            an ``int`` if ``other`` is a :class:`~rockefeller.money.Money`.
+        """
+        _check_operand(operation, other)
+        if other.currency != self.currency:
+            raise MoneyError('Currencies differ: {} and {}.'.format(
+                self.currency, other.currency))
+        if isinstance(other, Money):
+            exponent = max(self.exponent, get_places(other.amount))
+            other_units = to_units(other.amount, exponent)
+        else:
+            if len(other) != len(self):
+                raise ValueError('MoneyArray lengths differ: {} and {}.'.format(
+                    len(self), len(other)))
+            exponent = max(self.exponent, other.exponent)
+            other_units = _rescale(other.units, other.exponent, exponent)
+        units = _rescale(self.units, self.exponent, exponent)
+        return units, other_units, exponent
+
+    def __len__(self):
+        return len(self.units)
+
+    def __iter__(self):
+        exponent, currency = self.exponent, self.currency
+        for unit in self.units:
+            yield Money(from_units(unit, exponent), currency)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._new(self.units[index])
+        return Money(from_units(self.units[index], self.exponent),
+                     self.currency)
+
+    def __repr__(self):
+        return 'MoneyArray({!r}, {!r}, exponent={!r})'.format(
+            self.units.tolist(), self.currency, self.exponent)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+        if other.currency != self.currency or len(other) != len(self):
+            return False
+        exponent = max(self.exponent, other.exponent)
+        return (_rescale(self.units, self.exponent, exponent) ==
+                _rescale(other.units, other.exponent, exponent))
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        units, other_units, exponent = self._align('+', other)
+        if isinstance(other_units, integer_types):
+            return self._new((unit + other_units for unit in units), exponent)
+        return self._new(map(operator.add, units, other_units), exponent)
+
+    def __sub__(self, other):
+        units, other_units, exponent = self._align('-', other)
+        if isinstance(other_units, integer_types):
+            return self._new((unit - other_units for unit in units), exponent)
+        return self._new(map(operator.sub, units, other_units), exponent)
+
+    def __mul__(self, other):
+        if isinstance(other, (MoneyArray, Money)):
+            msg = "unsupported operand type(s) for *: 'MoneyArray' and '%r'" % (
+                other.__class__)
+            raise TypeError(msg)
+        factor = to_decimal(other)
+        places = get_places(factor)
+        factor = to_units(factor, places)
+        units = [unit * factor for unit in self.units]
+        # The digits added by the factor are dropped while they are zeros,
+        # the rest make the exponent grow. Round the result to get back to
+        # the currency exponent.
+        while places and not any(unit % 10 for unit in units):
+            units = [unit // 10 for unit in units]
+            places -= 1
+        return self._new(units, self.exponent + places)
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return self._new(-unit for unit in self.units)
+
+    def compare(self, other):
+        """Compare element by element with another array or a single money.
+
+        :param other: :class:`~rockefeller.arrays.MoneyArray` of the same
+            length or :class:`~rockefeller.money.Money` instance.
+
+        :return: ``array`` of ``-1``, ``0`` or ``1`` values, whether each
+            amount is lower, equal or greater than the other one.
+        """
+        units, other_units, _ = self._align('compare', other)
+        if isinstance(other_units, integer_types):
+            other_units = [other_units] * len(units)
+        return array('b', ((unit > other_unit) - (unit < other_unit)
+                           for unit, other_unit in zip(units, other_units)))
+
+    def sum(self):
+        """Sum all the amounts.
+
+        :return: :class:`~rockefeller.money.Money` instance.
+        """
+        return Money(from_units(sum(self.units), self.exponent),
+                     self.currency)
+
+    def rounded(self):
+        """Round every amount using currency's exponent, the same way
+        :func:`~rockefeller.money.round_amount` does.
+
+        :return: :class:`~rockefeller.arrays.MoneyArray` instance.
+        """
+        exponent = self.currency.exponent
+        if self.exponent <= exponent:
+            return self._new(_rescale(self.units, self.exponent, exponent),
+                             exponent)
+        divisor = 10 ** (self.exponent - exponent)
+
+        def round_half_up(unit):
+            quotient, remainder = divmod(abs(unit), divisor)
+            if remainder * 2 >= divisor:
+                quotient += 1
+            return -quotient if unit < 0 else quotient
+
+        return self._new((round_half_up(unit) for unit in self.units),
+                         exponent)
+
+
+def allocate_many(moneys, ratios):
+    """Distribute several amounts of money proportionally to the same ratios,
+    like :func:`~rockefeller.money.allocate` does for each of them.
+
+    :param moneys: :class:`~rockefeller.arrays.MoneyArray` instance or
+        iterable of :class:`~rockefeller.money.Money` objects of the same
+        currency. Amounts must not have more digits than the currency
+        exponent.
+    :param ratios: Iterable of non negative numbers.
+
+    :return: List of :class:`~rockefeller.arrays.MoneyArray` instances, one
+        per ratio. Item ``i`` of each array is a part of the ``i`` money.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if an amount has
+        more digits than the currency exponent.
+    :raises: :class:`ValueError` if ratios are empty, negative, not finite
+        or all zero.
+    """
+    ratios, total = _get_ratios(ratios)
+    if not isinstance(moneys, MoneyArray):
+        moneys = MoneyArray.from_moneys(moneys)
+    currency = moneys.currency
+    exponent = currency.exponent
+    units = moneys.units
+    if moneys.exponent > exponent:
+        divisor = 10 ** (moneys.exponent - exponent)
+        if any(unit % divisor for unit in units):
+            raise MoneyError(
+                'Amounts have more than {} decimal digits.'.format(exponent))
+        units = [unit // divisor for unit in units]
+    else:
+        units = _rescale(units, moneys.exponent, exponent)
+
+    parts = [array(TYPECODE) for _ in ratios]
+    appends = [part.append for part in parts]
+    for unit in units:
+        shares = _allocate_units(unit, ratios, total)
+        for append, share in zip(appends, shares):
+            append(share)
+    return [MoneyArray(part, currency, exponent) for part in parts]
+
+
+def split_many(moneys, n):
+    """Split several amounts of money into ``n`` parts as equal as possible,
+    like :func:`~rockefeller.money.split` does for each of them.
+
+    See :func:`~rockefeller.arrays.allocate_many`.
+
+    :param n: Number of parts. Positive ``int``.
+
+    :return: List of ``n`` :class:`~rockefeller.arrays.MoneyArray` instances.
+
+    :raises: :class:`TypeError` if ``n`` isn't an integer.
+    :raises: :class:`ValueError` if ``n`` isn't positive.
+    """
+    return allocate_many(moneys, _get_parts(n))
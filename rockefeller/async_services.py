@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""asyncio interface to exchange rates services. Requires Python 3.5+."""
+import asyncio
+import datetime
+import decimal
+import io
+import json
+import ssl
+from urllib.parse import urlencode, urlsplit
+
+from .services import OpenExchangeRates, ServiceError, _get_date
+
+
+def _get_error_description(status, body):
+    """Get the description of an error response of the service."""
+    try:
+        return json.loads(body.decode('utf-8'))['description']
+    except (ValueError, KeyError, TypeError):
+        return 'HTTP status {}'.format(status)
+
+
+class KeepAliveTransport(object):
+    """HTTP/1.1 transport keeping connections open between requests.
+
+    Idle connections are pooled per host and reused by the next request to
+    the same host.
+
+    Initialization params:
+        `max_connections`
+            Defaults to `4`. Maximum number of requests in flight at the same
+            time. Clients sharing a transport share this limit.
+
+        `ssl_context`
+            SSL context for https requests. Defaults to
+            :func:`ssl.create_default_context`.
+    """
+
+    def __init__(self, max_connections=4, ssl_context=None):
+        self.max_connections = max_connections
+        self.ssl_context = ssl_context
+        self.semaphore = None
+        self.idle = {}
+        self.connections_opened = 0
+
+    def _get_semaphore(self):
+        # Created lazily so it belongs to the running event loop.
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_connections)
+        return self.semaphore
+
+    async def _connect(self, scheme, host, port):
+        context = None
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        connection = await asyncio.open_connection(host, port, ssl=context)
+        self.connections_opened += 1
+        return connection
+
+    async def request(self, url, headers=None):
+        """Make a GET request.
+
+        :param url: Requested url.
+        :param headers: Dictionary of extra request headers.
+
+        :return: ``(status, headers, body)`` tuple. Header names are lower
+            case and body is :class:`bytes`.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = scheme, parts.hostname, port
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        lines = ['GET {} HTTP/1.1'.format(target),
+                 'Host: {}'.format(parts.netloc),
+                 'Connection: keep-alive']
+        lines.extend('{}: {}'.format(h, v) for h, v in (headers or {}).items())
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        async with self._get_semaphore():
+            idle = self.idle.setdefault(key, [])
+            while idle:
+                reader, writer = idle.pop()
+                try:
+                    response = await self._send(reader, writer, request)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server closed the idle connection.
+                    continue
+                return self._release(key, reader, writer, response)
+
+            reader, writer = await self._connect(*key)
+            response = await self._send(reader, writer, request)
+            return self._release(key, reader, writer, response)
+
+    def _release(self, key, reader, writer, response):
+        status, headers, body, keep_alive = response
+        if keep_alive:
+            self.idle[key].append((reader, writer))
+        else:
+            writer.close()
+        return status, headers, body
+
+    async def _send(self, reader, writer, request):
+        """Send a request and read its response. The connection is closed if
+        anything fails.
+        """
+        try:
+            writer.write(request)
+            await writer.drain()
+            return await self._read_response(reader)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server.')
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (version != 'HTTP/1.0' and
+                      headers.get('connection', '').lower() != 'close')
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        return int(status), headers, body, keep_alive
+
+    async def close(self):
+        """Close every idle connection."""
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+
+class AsyncOpenExchangeRates(OpenExchangeRates):
+    """asyncio interface to openexchangerates.org service.
+
+    The methods requesting the service are coroutines, see
+    :class:`~rockefeller.services.OpenExchangeRates` for their results.
+
+    Initialization params:
+        `app_id`
+            Your account `app_id`
+
+        `use_https`
+            Defaults to `False`. Whether or not use https as the protocol.
+
+        `transport`
+            Object with a ``request(url, headers=None)`` coroutine method
+            returning a ``(status, headers, body)`` tuple. Defaults to a new
+            :class:`~rockefeller.async_services.KeepAliveTransport`.
+
+        `cache`
+            Optional :class:`~rockefeller.services.DiskCache` where historical
+            rates are kept.
+    """
+
+    def __init__(self, app_id, use_https=False, transport=None, cache=None):
+        super(AsyncOpenExchangeRates, self).__init__(app_id, use_https, cache)
+        if transport is None:
+            transport = KeepAliveTransport()
+        self.transport = transport
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.transport.close()
+
+    async def _request(self, endpoint, params):
+        """Request an endpoint of the service.
+
+        :return: Body of the response as :class:`bytes`.
+        """
+        params.update(app_id=self.app_id)
+        url = self.get_url(endpoint) + '?' + urlencode(params)
+        status, _, body = await self.transport.request(url)
+        if status != 200:
+            raise ServiceError(_get_error_description(status, body))
+        return body
+
+    async def fetch(self, endpoint, **params):
+        """Get exchange rates from an endpoint of the service.
+
+        :param endpoint: Name of the endpoint, for example ``'latest'``.
+        :param \\*\\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.Results`
+            instance.
+
+        :raises: :class:`~rockefeller.services.ServiceError` if the service
+            answers with an error.
+        """
+        body = await self._request(endpoint, params)
+        rates = json.loads(body.decode('utf-8'), parse_float=decimal.Decimal)
+        if 'base' not in rates:
+            raise ServiceError(rates.get('description', 'Unknow Error'))
+        return self.Results(rates)
+
+    async def latest(self, **params):
+        """Get latest exchange rates.
+
+        :param \\*\\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.Results`
+            instance. Each iterated value is a
+            :class:`rockefeller.exchange_rates.ExchangeRate` instance.
+        """
+        return await self.fetch('latest', **params)
+
+    async def historical(self, date, **params):
+        """Get exchange rates of a given date.
+
+        If the service has a cache the rates are only requested once per
+        date.
+
+        :param date: :class:`datetime.date` instance or ISO formatted date.
+        :param \\*\\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.Results`
+            instance.
+        """
+        if self.cache is not None:
+            rates = self.cache.get(date, params)
+            if rates is not None:
+                return self.Results(rates)
+        results = await self.fetch('historical/' + _get_date(date), **params)
+        if self.cache is not None:
+            self.cache.set(date, params, results.rates)
+        return results
+
+    async def historical_range(self, start, end, **params):
+        """Get exchange rates of every date between two dates. The dates are
+        requested concurrently.
+
+        :param start: First date. :class:`datetime.date` instance.
+        :param end: Last date, included. :class:`datetime.date` instance.
+        :param \\*\\*params: Get params passed to the service.
+
+        :return: List of ``(date, results)`` tuples, like :meth:`historical`
+            returns.
+        """
+        dates = []
+        date = start
+        while date <= end:
+            dates.append(date)
+            date += datetime.timedelta(days=1)
+        results = await asyncio.gather(*[self.historical(date, **params)
+                                         for date in dates])
+        return list(zip(dates, results))
+
+    async def stream(self, endpoint, **params):
+        """Get exchange rates from an endpoint of the service. They are
+        parsed while they are iterated.
+
+        :param endpoint: Name of the endpoint, for example ``'latest'``.
+        :param \\*\\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.StreamResults`
+            instance.
+        """
+        body = await self._request(endpoint, params)
+        return self.StreamResults(io.BytesIO(body))
+
+    async def time_series(self, start, end, **params):
+        """Get exchange rates of every date between two dates.
+
+        :param start: First date. :class:`datetime.date` instance or ISO
+            formatted date.
+        :param end: Last date, included. :class:`datetime.date` instance or
+            ISO formatted date.
+        :param \\*\\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.StreamResults`
+            instance. Use its ``iter_dated`` method for getting the rates
+            together with their date.
+        """
+        params.update(start=_get_date(start), end=_get_date(end))
+        return await self.stream('time-series', **params)
+
+    async def fetch_many(self, requests):
+        """Fetch several endpoints concurrently. The number of requests in
+        flight is bounded by the transport.
+
+        :param requests: Iterable of ``(endpoint, params)`` tuples.
+
+        :return: List of
+            :class:`rockefeller.services.OpenExchangeRates.Results`
+            instances in the same order as ``requests``.
+        """
+        return await asyncio.gather(*[self.fetch(endpoint, **params)
+                                      for endpoint, params in requests])
@@ -1,21 +1,128 @@
 # -*- coding: utf-8 -*-
+import threading
+import weakref
 from collections import namedtuple
+from contextlib import contextmanager
 
 from six import add_metaclass
 
+from .utils import ContextVar
+
+_store = ContextVar('rockefeller.currency_store', default=None)
+_attribute_caches = weakref.WeakKeyDictionary()
+_interned = {}
+
+
+@contextmanager
+def using_currencies(store):
+    """Use a currency store instead of ``Currency.store`` in the current
+    context. Other threads and asyncio tasks keep using their own store.
+
+    :param store: A currency store object.
+    """
+    token = _store.set(store)
+    try:
+        yield store
+    finally:
+        _store.reset(token)
+
+
+_iso_indexes = None
+
+
+def _forget(store, code):
+    """Drop a code from the ``Currency.XXX`` cache of a store."""
+    cache = _attribute_caches.get(store)
+    if cache:
+        cache.pop(code, None)
+
+
+def _to_numeric(numeric):
+    """Get a numeric code as an ``int``, ``None`` if it isn't numeric."""
+    try:
+        return int(numeric)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_iso_indexes():
+    """Get the numeric and symbol indexes of the bundled ISO 4217 table.
+
+    :return: ``(by_numeric, by_symbol)`` tuple of dictionaries mapping
+        numeric codes to an alpha code and symbols to a list of alpha codes.
+    """
+    global _iso_indexes
+    if _iso_indexes is None:
+        from .iso4217 import CURRENCIES
+        by_numeric = {}
+        by_symbol = {}
+        for code, (_, numeric, _, symbol) in sorted(CURRENCIES.items()):
+            by_numeric[numeric] = code
+            if symbol:
+                by_symbol.setdefault(symbol, []).append(code)
+        _iso_indexes = by_numeric, by_symbol
+    return _iso_indexes
+
 
 class MemoryCurrency(object):
-    __slots__ = 'currencies'
+    """Currency store keeping the currencies in memory.
+
+    Besides their code, currencies are indexed by numeric code and symbol.
+    Currencies with a non numeric ``numeric`` value are only found by code
+    and symbol.
 
-    def __init__(self):
+    Initialization params:
+
+        `iso4217`
+            Defaults to `False`. Whether or not support every ISO 4217
+            currency. They are loaded from :mod:`rockefeller.iso4217` the
+            first time they are looked up, so only the used ones are built.
+            ISO currencies can still be replaced or stop being supported.
+    """
+    __slots__ = ('currencies', 'by_numeric', 'by_symbol', 'iso4217',
+                 'unsupported', '__weakref__')
+
+    def __init__(self, iso4217=False):
         self.currencies = {}
+        self.by_numeric = {}
+        self.by_symbol = {}
+        self.iso4217 = iso4217
+        self.unsupported = frozenset()
+
+    def _add(self, currencies, by_numeric, by_symbol, currency):
+        code = currency.code
+        if code in currencies:
+            self._remove(currencies, by_numeric, by_symbol, code)
+        currencies[code] = currency
+        numeric = _to_numeric(currency.numeric)
+        if numeric is not None:
+            by_numeric[numeric] = currency
+        if currency.symbol:
+            by_symbol[currency.symbol] = (by_symbol.get(currency.symbol, ()) +
+                                          (currency,))
+
+    def _remove(self, currencies, by_numeric, by_symbol, code):
+        currency = currencies.pop(code)
+        numeric = _to_numeric(currency.numeric)
+        if numeric is not None and by_numeric.get(numeric) is currency:
+            del by_numeric[numeric]
+        if currency.symbol:
+            others = tuple(other for other in by_symbol[currency.symbol]
+                           if other is not currency)
+            if others:
+                by_symbol[currency.symbol] = others
+            else:
+                del by_symbol[currency.symbol]
 
     def support(self, currency):
         """Store a currency.
 
         :param currency: :class:`rockefeller.currency.Currency` instance.
         """
-        self.currencies[currency.code] = currency
+        self._add(self.currencies, self.by_numeric, self.by_symbol, currency)
+        if currency.code in self.unsupported:
+            self.unsupported = self.unsupported - set([currency.code])
+        _forget(self, currency.code)
 
     def not_support(self, currency):
         """Remove a currency support.
@@ -24,7 +131,11 @@ class MemoryCurrency(object):
         """
         code = currency.code
         if code in self.currencies:
-            del self.currencies[code]
+            self._remove(self.currencies, self.by_numeric, self.by_symbol,
+                         code)
+        if self.iso4217:
+            self.unsupported = self.unsupported | set([code])
+        _forget(self, code)
 
     def get(self, code):
         """Get a currency by its code.
@@ -33,12 +144,152 @@ class MemoryCurrency(object):
 
         :return: :class:`rockefeller.currency.Currency` instance.
         """
-        return self.currencies.get(code)
+        currency = self.currencies.get(code)
+        if currency is None and self.iso4217:
+            currency = self._load(code)
+        return currency
+
+    def get_by_numeric(self, numeric):
+        """Get a currency by its numeric code.
+
+        :param numeric: ISO 4217 numeric code. As an ``int`` or string.
+
+        :return: :class:`rockefeller.currency.Currency` instance.
+        """
+        numeric = _to_numeric(numeric)
+        if numeric is None:
+            return None
+        currency = self.by_numeric.get(numeric)
+        if currency is None and self.iso4217:
+            code = _get_iso_indexes()[0].get(numeric)
+            if code is not None and code not in self.currencies:
+                currency = self._load(code)
+        return currency
+
+    def find_by_symbol(self, symbol):
+        """Find the currencies using a symbol.
+
+        :param symbol: Currency symbol.
+
+        :return: List of :class:`rockefeller.currency.Currency` instances
+            sorted by code.
+        """
+        if self.iso4217:
+            for code in _get_iso_indexes()[1].get(symbol, ()):
+                if code not in self.currencies:
+                    self._load(code)
+        return sorted(self.by_symbol.get(symbol, ()),
+                      key=lambda currency: currency.code)
+
+    def _load(self, code):
+        from .iso4217 import CURRENCIES
+        if code in self.unsupported or code not in CURRENCIES:
+            return None
+        name, numeric, exponent, symbol = CURRENCIES[code]
+        return self._add_loaded(intern_currency(Currency(
+            name=name, code=code, numeric=numeric, exponent=exponent,
+            symbol=symbol)))
+
+    def _add_loaded(self, currency):
+        self._add(self.currencies, self.by_numeric, self.by_symbol, currency)
+        _forget(self, currency.code)
+        return currency
+
+
+class CopyOnWriteCurrency(MemoryCurrency):
+    """Currency store keeping the currencies in memory, safe to share between
+    threads.
+
+    Lookups read the current dictionaries without any lock. Writes are
+    serialized with a lock and publish changed copies of the dictionaries.
+
+    Initialization params:
+
+        `iso4217`
+            Defaults to `False`. Whether or not support every ISO 4217
+            currency, like :class:`~rockefeller.currency.MemoryCurrency`.
+    """
+    __slots__ = 'lock'
+
+    def __init__(self, iso4217=False):
+        super(CopyOnWriteCurrency, self).__init__(iso4217)
+        self.lock = threading.Lock()
+
+    def _publish(self, change, value):
+        currencies = dict(self.currencies)
+        by_numeric = dict(self.by_numeric)
+        by_symbol = dict(self.by_symbol)
+        change(currencies, by_numeric, by_symbol, value)
+        self.by_numeric = by_numeric
+        self.by_symbol = by_symbol
+        self.currencies = currencies
+
+    def support(self, currency):
+        """Store a currency.
+
+        :param currency: :class:`rockefeller.currency.Currency` instance.
+        """
+        with self.lock:
+            self._publish(self._add, currency)
+            self.unsupported = self.unsupported - set([currency.code])
+            _forget(self, currency.code)
+
+    def _add_loaded(self, currency):
+        with self.lock:
+            # Another thread may have changed the currency since the lookup.
+            code = currency.code
+            if code in self.unsupported:
+                return None
+            if code in self.currencies:
+                return self.currencies[code]
+            self._publish(self._add, currency)
+            _forget(self, code)
+        return currency
+
+    def not_support(self, currency):
+        """Remove a currency support.
+
+        :param currency: :class:`rockefeller.currency.Currency` instance.
+        """
+        with self.lock:
+            if self.iso4217:
+                self.unsupported = self.unsupported | set([currency.code])
+            if currency.code in self.currencies:
+                self._publish(self._remove, currency.code)
+            _forget(self, currency.code)
+
+
+def _get_attribute_cache(store):
+    """Get the cache of ``Currency.XXX`` lookups of a store.
+
+    :return: Dictionary mapping codes to currencies, ``None`` if the store
+        can't be weakly referenced.
+    """
+    try:
+        return _attribute_caches[store]
+    except KeyError:
+        cache = _attribute_caches[store] = {}
+        return cache
+    except TypeError:
+        return None
 
 
 class CurrencyType(type):
     def __getattr__(cls, code):
-        return cls.get(code)
+        store = _store.get()
+        if store is None:
+            store = cls.store
+        cache = _get_attribute_cache(store)
+        if cache is None:
+            return store.get(code)
+
+        currency = cache.get(code)
+        if currency is None:
+            # Missing currencies aren't cached, they may be supported later.
+            currency = store.get(code)
+            if currency is not None:
+                cache[code] = currency
+        return currency
 
 
 @add_metaclass(CurrencyType)
@@ -75,7 +326,11 @@ class Currency(namedtuple('Currency', 'name code numeric exponent symbol')):
         return self.code
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.code == other.code
+        return self is other or (isinstance(other, self.__class__) and
+                                 self.code == other.code)
+
+    def __ne__(self, other):
+        return not self == other
 
     def __hash__(self):
         return int(self.numeric)
@@ -86,10 +341,13 @@ class Currency(namedtuple('Currency', 'name code numeric exponent symbol')):
         :param store: A currency store object.
 
         :return: If ``store`` param is not ``None`` is returned, otherwise
-            ``Currency.store`` is returned.
+            the store of the current context or ``Currency.store`` is
+            returned.
         """
         if store is None:
-            store = self.__class__.store
+            store = _store.get()
+            if store is None:
+                store = self.__class__.store
 
         return store
 
@@ -100,7 +358,9 @@ class Currency(namedtuple('Currency', 'name code numeric exponent symbol')):
 
         :return: ``self`` :class:`~rockefeller.currency.Currency` instance.
         """
-        self._get_store(store).support(self)
+        store = self._get_store(store)
+        store.support(self)
+        self.__class__.clear_cache(store, self.code)
         return self
 
     def not_support(self, store=None):
@@ -110,9 +370,62 @@ class Currency(namedtuple('Currency', 'name code numeric exponent symbol')):
 
         :return: ``self`` :class:`~rockefeller.currency.Currency` instance.
         """
-        self._get_store(store).not_support(self)
+        store = self._get_store(store)
+        store.not_support(self)
+        self.__class__.clear_cache(store, self.code)
         return self
 
+    @classmethod
+    def clear_cache(cls, store=None, code=None):
+        """Forget the currencies looked up as ``Currency.XXX`` attributes.
+
+        The cache is kept per store. Memory stores clear it when currencies
+        are supported or not supported, and so do the ``Currency`` objects
+        for any store. Call this after changing another store by other
+        means.
+
+        :param store: Clear the cache of this store only.
+        :param code: Clear only this currency code.
+        """
+        if store is None:
+            stores = list(_attribute_caches.keys())
+        else:
+            stores = [store]
+        for store in stores:
+            try:
+                cache = _attribute_caches.get(store)
+            except TypeError:
+                cache = None
+            if not cache:
+                continue
+            if code is None:
+                cache.clear()
+            else:
+                cache.pop(code, None)
+
     @classmethod
     def get(cls, code):
-        return cls.store.get(code)
+        store = _store.get()
+        if store is None:
+            store = cls.store
+        return store.get(code)
+
+
+def intern_currency(currency):
+    """Get the shared instance of a currency.
+
+    Stores building currencies on every lookup should intern them, so equal
+    currencies are the same object and comparing them is an identity check.
+    A currency replaces the shared instance of its code if any of their
+    fields differ.
+
+    :param currency: :class:`rockefeller.currency.Currency` instance.
+
+    :return: :class:`rockefeller.currency.Currency` instance equal to
+        ``currency``.
+    """
+    interned = _interned.get(currency.code)
+    if interned is not None and tuple.__eq__(interned, currency):
+        return interned
+    _interned[currency.code] = currency
+    return currency
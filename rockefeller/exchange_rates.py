@@ -1,6 +1,49 @@
 # -*- coding: utf-8 -*-
 import decimal
-from collections import namedtuple
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+
+from six import iteritems, itervalues
+
+from .currency import Currency
+from .utils import ContextVar, decimal_context
+
+
+_missing = object()
+_store = ContextVar('rockefeller.exchange_rates_store', default=None)
+
+
+@contextmanager
+def using_rates(store):
+    """Use an exchange rates store instead of the one of every
+    :class:`~rockefeller.exchange_rates.ExchangeRates` object in the current
+    context. Other threads and asyncio tasks keep using their own store.
+
+    :param store: An exchange rates store object.
+    """
+    token = _store.set(store)
+    try:
+        yield store
+    finally:
+        _store.reset(token)
+
+
+def _to_decimal(rate):
+    if not isinstance(rate, decimal.Decimal):
+        rate = decimal.Decimal(str(rate))
+    return rate
+
+
+def _stores_decimals(store):
+    """Whether or not ``store`` takes and returns rates as ``decimal``
+    numbers instead of strings.
+    """
+    return getattr(store, 'stores_decimals', False) is True
 
 
 class ExchangeRate(namedtuple('ExchangeRate', 'code_from code_to rate')):
@@ -19,14 +62,39 @@ class ExchangeRate(namedtuple('ExchangeRate', 'code_from code_to rate')):
             Exchange rate between currency codes. numeric or string.
     """
     def __new__(cls, code_from, code_to, rate):
-        if not isinstance(rate, decimal.Decimal):
-            rate = decimal.Decimal(str(rate))
-        return super(ExchangeRate, cls).__new__(cls, code_from, code_to, rate)
+        return super(ExchangeRate, cls).__new__(cls, code_from, code_to,
+                                                _to_decimal(rate))
+
+
+class SnapshotChanges(namedtuple('SnapshotChanges',
+                                  'added updated removed unchanged')):
+    """Summary of the changes made by
+    :meth:`~rockefeller.exchange_rates.ExchangeRates.apply_snapshot`.
+
+    ``added`` and ``updated`` are lists of
+    :class:`~rockefeller.exchange_rates.ExchangeRate` objects, ``removed`` is
+    a list of ``(code_from, code_to)`` tuples and ``unchanged`` the number of
+    rates that weren't written.
+    """
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+    __nonzero__ = __bool__
 
 
 class ExchangeRates(object):
     def __init__(self, store):
         self.store = store
+        self.snapshots = weakref.WeakKeyDictionary()
+
+    def _get_store(self):
+        """Get the store of the current context, set with
+        :func:`~rockefeller.exchange_rates.using_rates`, or ``self.store``.
+        """
+        store = _store.get()
+        if store is None:
+            store = self.store
+        return store
 
     def add_exchange_rate(self, base_currency, currency, exchange_rate):
         """Store an exchange rate between two currencies.
@@ -36,8 +104,12 @@ class ExchangeRates(object):
         :param exchange_rate: Exchange rate between ``base_currency`` and
             ``currency``.
         """
-        self.store.add_exchange_rate(base_currency, currency,
-                                     str(exchange_rate))
+        store = self._get_store()
+        if _stores_decimals(store):
+            exchange_rate = _to_decimal(exchange_rate)
+        else:
+            exchange_rate = str(exchange_rate)
+        store.add_exchange_rate(base_currency, currency, exchange_rate)
 
     def remove_exchange_rate(self, base_currency, currency):
         """Remove an exchange rate between two currencies.
@@ -47,7 +119,7 @@ class ExchangeRates(object):
         :param exchange_rate: Exchange rate between ``base_currency`` and
             ``currency``.
         """
-        self.store.remove_exchange_rate(base_currency, currency)
+        self._get_store().remove_exchange_rate(base_currency, currency)
 
     def get_exchange_rate(self, base_currency, currency):
         """Get exchange rate of a currency relatively to another one.
@@ -64,21 +136,124 @@ class ExchangeRates(object):
 
         :return: Exchange rate as a ``decimal``.
         """
-        rate = self.store.get_exchange_rate(base_currency, currency)
+        store = self._get_store()
+        rate = store.get_exchange_rate(base_currency, currency)
         if rate is None:
-            inverse = self.store.get_exchange_rate(currency, base_currency)
+            inverse = store.get_exchange_rate(currency, base_currency)
             if inverse:
-                rate = decimal.Decimal(1) / decimal.Decimal(inverse)
-        else:
+                rate = decimal_context.divide(1, decimal.Decimal(inverse))
+        elif not _stores_decimals(store):
             rate = decimal.Decimal(str(rate))
 
         return rate
 
+    def apply_snapshot(self, results, previous=None):
+        """Update the store with a complete set of exchange rates, like the
+        ones returned by
+        :meth:`rockefeller.services.OpenExchangeRates.latest`.
+
+        Only new or changed rates are written. Rates of the previous snapshot
+        applied to the same store that are missing in this one are removed.
+        Rates of not supported currencies are ignored.
+
+        The previous snapshot is remembered in memory, per store, so it's
+        lost when the process restarts and rates vanished in between are
+        never removed from a persistent store. Persist the codes of the
+        applied rates and pass them as ``previous`` to avoid it. Stores that
+        can't be weakly referenced don't remember their snapshot.
+
+        Stores with ``get_exchange_rates`` and ``add_exchange_rates`` methods
+        are read and written with a single call each.
+
+        :param results: Iterable of
+            :class:`~rockefeller.exchange_rates.ExchangeRate` objects. Results
+            with a false ``modified`` attribute are not applied.
+        :param previous: Iterable of ``(code_from, code_to)`` tuples, the
+            rates of the previous snapshot. Defaults to the snapshot last
+            applied to the store by this object.
+
+        :return: :class:`~rockefeller.exchange_rates.SnapshotChanges`
+            instance.
+        """
+        if getattr(results, 'modified', True) is False:
+            return SnapshotChanges([], [], [], 0)
+
+        store = self._get_store()
+        snapshot = OrderedDict()
+        for exchange_rate in results:
+            base_currency = Currency.get(exchange_rate.code_from)
+            currency = Currency.get(exchange_rate.code_to)
+            if base_currency is not None and currency is not None:
+                key = exchange_rate.code_from, exchange_rate.code_to
+                snapshot[key] = base_currency, currency, exchange_rate
+
+        if previous is None:
+            try:
+                previous = self.snapshots.get(store, {})
+            except TypeError:
+                previous = {}
+        else:
+            previous = dict((key, (Currency.get(key[0]), Currency.get(key[1])))
+                            for key in previous)
+        removed = []
+        for key, (base_currency, currency) in iteritems(previous):
+            if (key not in snapshot and base_currency is not None and
+                    currency is not None):
+                store.remove_exchange_rate(base_currency, currency)
+                removed.append(key)
+
+        pairs = [(base_currency, currency)
+                 for base_currency, currency, _ in itervalues(snapshot)]
+        if hasattr(store, 'get_exchange_rates'):
+            current = store.get_exchange_rates(pairs)
+        else:
+            current = [store.get_exchange_rate(*pair) for pair in pairs]
+
+        native = _stores_decimals(store)
+        added = []
+        updated = []
+        rates = []
+        unchanged = 0
+        for (base_currency, currency, exchange_rate), rate in zip(
+                itervalues(snapshot), current):
+            if rate is not None and _to_decimal(rate) == exchange_rate.rate:
+                unchanged += 1
+                continue
+            (added if rate is None else updated).append(exchange_rate)
+            rate = exchange_rate.rate if native else str(exchange_rate.rate)
+            rates.append((base_currency, currency, rate))
+
+        if hasattr(store, 'add_exchange_rates'):
+            if rates:
+                store.add_exchange_rates(rates)
+        else:
+            for rate in rates:
+                store.add_exchange_rate(*rate)
+
+        try:
+            self.snapshots[store] = dict((key, (base_currency, currency))
+                                         for key, (base_currency, currency, _)
+                                         in iteritems(snapshot))
+        except TypeError:
+            pass
+        return SnapshotChanges(added, updated, removed, unchanged)
+
 
 class MemoryExchangeRates(object):
+    """Exchange rates store keeping the rates in memory.
 
-    def __init__(self):
+    Initialization params:
+
+        `native`
+            Defaults to `False`. Whether or not store rates as ``decimal``
+            numbers. Native stores also keep the inverse of every rate, so
+            inverse rates are returned without dividing at lookup time.
+    """
+
+    def __init__(self, native=False):
         self.rates = {}
+        self.inverses = set()
+        self.stores_decimals = native
 
     def _get_key(self, base_currency, currency):
         return hash(base_currency), hash(currency)
@@ -92,8 +267,28 @@ class MemoryExchangeRates(object):
             relation to ``base_currency``.
             :class:`~rockefeller.currency.Currency` instance.
         :param exchange_rate: Exchange rate as a string. :class:`str` instance.
+            Native stores convert it into a ``decimal``.
         """
-        self.rates[self._get_key(base_currency, currency)] = exchange_rate
+        self._add(self.rates, self.inverses, base_currency, currency,
+                  exchange_rate)
+
+    def _add(self, rates, inverses, base_currency, currency, exchange_rate):
+        key = self._get_key(base_currency, currency)
+        if not self.stores_decimals:
+            rates[key] = exchange_rate
+        else:
+            exchange_rate = rates[key] = _to_decimal(exchange_rate)
+            inverses.discard(key)
+            inverse_key = self._get_key(currency, base_currency)
+            if inverse_key in rates and inverse_key not in inverses:
+                return
+            if exchange_rate:
+                rates[inverse_key] = decimal_context.divide(1, exchange_rate)
+                inverses.add(inverse_key)
+            elif inverse_key in inverses:
+                # A zero rate has no inverse.
+                del rates[inverse_key]
+                inverses.discard(inverse_key)
 
     def remove_exchange_rate(self, base_currency, currency):
         """Remove exchange rate of one currency relatively to another one.
@@ -108,8 +303,15 @@ class MemoryExchangeRates(object):
             relation to ``base_currency``.
             :class:`~rockefeller.currency.Currency` instance.
         """
-        self.rates.pop(self._get_key(base_currency, currency), None)
-        self.rates.pop(self._get_key(currency, base_currency), None)
+        self._remove(self.rates, self.inverses, base_currency, currency)
+
+    def _remove(self, rates, inverses, base_currency, currency):
+        key = self._get_key(base_currency, currency)
+        inverse_key = self._get_key(currency, base_currency)
+        rates.pop(key, None)
+        rates.pop(inverse_key, None)
+        inverses.discard(key)
+        inverses.discard(inverse_key)
 
     def get_exchange_rate(self, base_currency, currency):
         """Get exchange rate of a currency relatively to another one.
@@ -120,10 +322,434 @@ class MemoryExchangeRates(object):
             relation to ``base_currency``.
             :class:`~rockefeller.currency.Currency` instance.
 
-        :return: Exchange rate as a string. :class:`str` instance.
+        :return: Exchange rate as a string. :class:`str` instance. Or as a
+            ``decimal`` if the store is native.
         """
         return self.rates.get(self._get_key(base_currency, currency))
 
+
+class CopyOnWriteExchangeRates(MemoryExchangeRates):
+    """Exchange rates store keeping the rates in memory, safe to share
+    between threads.
+
+    Lookups read the current ``rates`` dictionary without any lock. Writes
+    are serialized with a lock, change a copy of the rates and then publish
+    it, so a lookup never sees a partial update. Every write copies all the
+    rates, use :meth:`add_exchange_rates` for adding several at once.
+
+    Initialization params:
+
+        `native`
+            Defaults to `False`. Whether or not store rates and their
+            inverses as ``decimal`` numbers.
+    """
+
+    def __init__(self, native=False):
+        super(CopyOnWriteExchangeRates, self).__init__(native)
+        self.lock = threading.Lock()
+
+    def add_exchange_rate(self, base_currency, currency, exchange_rate):
+        self.add_exchange_rates([(base_currency, currency, exchange_rate)])
+
+    def add_exchange_rates(self, rates):
+        """Store several exchange rates publishing them at once.
+
+        :param rates: Iterable of ``(base_currency, currency, exchange_rate)``
+            tuples.
+        """
+        with self.lock:
+            new_rates = dict(self.rates)
+            inverses = set(self.inverses)
+            for base_currency, currency, exchange_rate in rates:
+                self._add(new_rates, inverses, base_currency, currency,
+                          exchange_rate)
+            self.inverses = inverses
+            self.rates = new_rates
+
+    def remove_exchange_rate(self, base_currency, currency):
+        with self.lock:
+            rates = dict(self.rates)
+            inverses = set(self.inverses)
+            self._remove(rates, inverses, base_currency, currency)
+            self.inverses = inverses
+            self.rates = rates
+
+
+class GraphExchangeRates(object):
+    """Exchange rates store that resolves rates between currencies without a
+    stored rate by chaining stored rates.
+
+    Currencies are the nodes of a graph and every rate added through this
+    store is an edge that can be walked in both directions. The best path is
+    the one with the fewest edges unless a ``weight`` function is given.
+    Resolved rates are memoized until a rate on their path changes.
+
+    Initialization params:
+
+        `store`
+            Exchange rates store where rates are kept.
+
+        `weight`
+            Optional function receiving the two currencies of an edge and
+            returning the cost of walking it.
+    """
+
+    def __init__(self, store, weight=None):
+        self.store = store
+        self.weight = weight
+        self.graph = {}
+        self.paths = {}
+        self.edges = {}
+
+    @property
+    def stores_decimals(self):
+        return _stores_decimals(self.store)
+
+    def _invalidate(self, base_currency, currency):
+        for key in self.edges.pop(frozenset((base_currency, currency)), ()):
+            self.paths.pop(key, None)
+
+    def add_exchange_rate(self, base_currency, currency, exchange_rate):
+        """Store exchange rate of one currency relatively to another one.
+
+        See :meth:`rockefeller.exchange_rates.MemoryExchangeRates.add_exchange_rate`.
+        """
+        self.store.add_exchange_rate(base_currency, currency, exchange_rate)
+        if currency in self.graph.get(base_currency, ()):
+            self._invalidate(base_currency, currency)
+        else:
+            # A new edge may shorten any resolved path.
+            self.graph.setdefault(base_currency, set()).add(currency)
+            self.graph.setdefault(currency, set()).add(base_currency)
+            self.paths.clear()
+            self.edges.clear()
+
+    def remove_exchange_rate(self, base_currency, currency):
+        """Remove exchange rate of one currency relatively to another one.
+
+        See :meth:`rockefeller.exchange_rates.MemoryExchangeRates.remove_exchange_rate`.
+        """
+        self.store.remove_exchange_rate(base_currency, currency)
+        self.graph.get(base_currency, set()).discard(currency)
+        self.graph.get(currency, set()).discard(base_currency)
+        self._invalidate(base_currency, currency)
+
+    def get_exchange_rate(self, base_currency, currency):
+        """Get exchange rate of a currency relatively to another one.
+
+        If there's no stored rate between the currencies, the rate of the best
+        path between them is returned.
+
+        :param base_currency: Currency used as the base.
+            :class:`~rockefeller.currency.Currency` instance.
+        :param currency: Currency you want to know its exchange rate in
+            relation to ``base_currency``.
+            :class:`~rockefeller.currency.Currency` instance.
+
+        :return: Exchange rate as stored or as a ``decimal`` if it's resolved
+            through a path, ``None`` if there's no path.
+        """
+        rate = self.store.get_exchange_rate(base_currency, currency)
+        if rate is not None or base_currency == currency:
+            return rate
+
+        key = base_currency, currency
+        try:
+            return self.paths[key]
+        except KeyError:
+            pass
+
+        path = self.find_path(base_currency, currency)
+        if path is None:
+            return None
+        rate = decimal.Decimal(1)
+        for edge in zip(path, path[1:]):
+            edge_rate = self._get_edge_rate(*edge)
+            if edge_rate is None:
+                return None
+            rate = decimal_context.multiply(rate, edge_rate)
+
+        self.paths[key] = rate
+        for edge in zip(path, path[1:]):
+            self.edges.setdefault(frozenset(edge), set()).add(key)
+        return rate
+
+    def _get_edge_rate(self, base_currency, currency):
+        rate = self.store.get_exchange_rate(base_currency, currency)
+        if rate is not None:
+            return _to_decimal(rate)
+        inverse = self.store.get_exchange_rate(currency, base_currency)
+        if inverse:
+            return decimal_context.divide(1, _to_decimal(inverse))
+        return None
+
+    def find_path(self, base_currency, currency):
+        """Find the best path between two currencies.
+
+        :return: List of currencies starting with ``base_currency`` and ending
+            with ``currency``, ``None`` if currencies aren't connected.
+        """
+        if base_currency not in self.graph or currency not in self.graph:
+            return None
+
+        weight = self.weight
+        counter = itertools.count(1)
+        queue = [(0, 0, base_currency)]
+        costs = {base_currency: 0}
+        previous = {base_currency: None}
+        while queue:
+            cost, _, node = heapq.heappop(queue)
+            if node == currency:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                return path[::-1]
+            if cost > costs[node]:
+                continue
+            for neighbour in self.graph[node]:
+                new_cost = cost + (1 if weight is None
+                                   else weight(node, neighbour))
+                if neighbour not in costs or new_cost < costs[neighbour]:
+                    costs[neighbour] = new_cost
+                    previous[neighbour] = node
+                    heapq.heappush(queue, (new_cost, next(counter), neighbour))
+
+        return None
+
+
+class RateMatrix(object):
+    """Read-only exchange rates store holding every cross rate between the
+    currencies of a snapshot of rates.
+
+    All the rates of the snapshot must share the same base currency, like the
+    ones returned by :meth:`rockefeller.services.OpenExchangeRates.latest`.
+    Cross rates are computed once when the matrix is built.
+
+    Initialization params:
+
+        `rates`
+            Iterable of :class:`~rockefeller.exchange_rates.ExchangeRate`
+            objects. Zero rates are skipped and the last rate of a repeated
+            currency wins.
+    """
+
+    stores_decimals = True
+
+    def __init__(self, rates):
+        base = None
+        codes = []
+        ordinals = {}
+        vector = []
+        for exchange_rate in rates:
+            if base is None:
+                base = exchange_rate.code_from
+                ordinals[base] = len(codes)
+                codes.append(base)
+                vector.append(decimal.Decimal(1))
+            elif exchange_rate.code_from != base:
+                raise ValueError('Rates of a RateMatrix must share the same '
+                                 'base currency: {} and {}.'.format(
+                                     base, exchange_rate.code_from))
+            code = exchange_rate.code_to
+            rate = _to_decimal(exchange_rate.rate)
+            if code == base or not rate:
+                continue
+            if code in ordinals:
+                vector[ordinals[code]] = rate
+            else:
+                ordinals[code] = len(codes)
+                codes.append(code)
+                vector.append(rate)
+
+        self.base = base
+        self.codes = codes
+        self.ordinals = ordinals
+        self.size = len(codes)
+        divide = decimal_context.divide
+        self.matrix = [divide(rate_to, rate_from)
+                       for rate_from in vector for rate_to in vector]
+
+    def add_exchange_rate(self, base_currency, currency, exchange_rate):
+        raise TypeError('RateMatrix is a read-only snapshot.')
+
+    def remove_exchange_rate(self, base_currency, currency):
+        raise TypeError('RateMatrix is a read-only snapshot.')
+
+    def get_exchange_rate(self, base_currency, currency):
+        """Get exchange rate of a currency relatively to another one.
+
+        :param base_currency: Currency used as the base.
+            :class:`~rockefeller.currency.Currency` instance.
+        :param currency: Currency you want to know its exchange rate in
+            relation to ``base_currency``.
+            :class:`~rockefeller.currency.Currency` instance.
+
+        :return: Exchange rate as a ``decimal``, ``None`` if any of the
+            currencies isn't in the snapshot.
+        """
+        ordinals = self.ordinals
+        try:
+            return self.matrix[ordinals[base_currency.code] * self.size +
+                               ordinals[currency.code]]
+        except (KeyError, AttributeError):
+            return None
+
+
+class CachedExchangeRates(object):
+    """Exchange rates store that caches the rates of another store.
+
+    Missing rates are cached too, so looking up a not supported pair doesn't
+    reach the backing store every time. Adding or removing a rate goes
+    through to the backing store and drops the cached rates of the pair in
+    both directions. The cache can be shared between threads.
+
+    Initialization params:
+
+        `store`
+            Backing exchange rates store.
+
+        `maxsize`
+            Defaults to `1024`. Maximum number of cached rates. The least
+            recently used rate is evicted when it's exceeded.
+
+        `ttl`
+            Defaults to `None`. Seconds a rate stays cached. `None` means
+            rates are cached until evicted.
+
+        `negative_ttl`
+            Seconds a missing rate stays cached. Defaults to ``ttl``.
+
+        `clock`
+            Defaults to :func:`time.time`. Function returning the current
+            time in seconds.
+    """
+
+    def __init__(self, store, maxsize=1024, ttl=None, negative_ttl=_missing,
+                 clock=time.time):
+        self.store = store
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is _missing else negative_ttl
+        self.clock = clock
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped on every write, so rates read from the store before it
+        # aren't cached after it.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stores_decimals(self):
+        return _stores_decimals(self.store)
+
+    def _get_key(self, base_currency, currency):
+        return hash(base_currency), hash(currency)
+
+    def _invalidate(self, base_currency, currency):
+        with self.lock:
+            self.generation += 1
+            self.cache.pop(self._get_key(base_currency, currency), None)
+            self.cache.pop(self._get_key(currency, base_currency), None)
+
+    def clear(self):
+        """Drop all the cached rates."""
+        with self.lock:
+            self.generation += 1
+            self.cache.clear()
+
+    def add_exchange_rate(self, base_currency, currency, exchange_rate):
+        """Store exchange rate of one currency relatively to another one.
+
+        See :meth:`rockefeller.exchange_rates.MemoryExchangeRates.add_exchange_rate`.
+        """
+        self.store.add_exchange_rate(base_currency, currency, exchange_rate)
+        self._invalidate(base_currency, currency)
+
+    def remove_exchange_rate(self, base_currency, currency):
+        """Remove exchange rate of one currency relatively to another one.
+
+        See :meth:`rockefeller.exchange_rates.MemoryExchangeRates.remove_exchange_rate`.
+        """
+        self.store.remove_exchange_rate(base_currency, currency)
+        self._invalidate(base_currency, currency)
+
+    def get_exchange_rate(self, base_currency, currency):
+        """Get exchange rate of a currency relatively to another one.
+
+        See :meth:`rockefeller.exchange_rates.MemoryExchangeRates.get_exchange_rate`.
+        """
+        cache = self.cache
+        key = self._get_key(base_currency, currency)
+        with self.lock:
+            entry = cache.pop(key, None)
+            if entry is not None:
+                rate, expires = entry
+                if expires is None or expires > self.clock():
+                    cache[key] = entry
+                    self.hits += 1
+                    return rate
+            self.misses += 1
+            generation = self.generation
+
+        # The backing store is reached without holding the lock.
+        rate = self.store.get_exchange_rate(base_currency, currency)
+        self._set(key, rate, generation)
+        return rate
+
+    def _set(self, key, rate, generation):
+        cache = self.cache
+        ttl = self.ttl if rate is not None else self.negative_ttl
+        entry = rate, None if ttl is None else self.clock() + ttl
+        with self.lock:
+            if generation != self.generation:
+                # A write happened while the rate was being read.
+                return
+            cache[key] = entry
+            if len(cache) > self.maxsize:
+                cache.popitem(last=False)
+
+    def get_exchange_rates(self, pairs):
+        """Get the exchange rates of several pairs of currencies.
+
+        Rates not cached are fetched with a single call to the backing store
+        if it supports ``get_exchange_rates``, so this can be used for warming
+        up the cache.
+
+        :param pairs: Iterable of ``(base_currency, currency)`` tuples.
+
+        :return: List of exchange rates in the same order as ``pairs``.
+        """
+        pairs = list(pairs)
+        now = self.clock()
+        rates = []
+        lookups = []
+        with self.lock:
+            for i, (base_currency, currency) in enumerate(pairs):
+                key = self._get_key(base_currency, currency)
+                entry = self.cache.pop(key, None)
+                if entry is not None and (entry[1] is None or entry[1] > now):
+                    self.cache[key] = entry
+                    self.hits += 1
+                    rates.append(entry[0])
+                else:
+                    self.misses += 1
+                    rates.append(None)
+                    lookups.append(i)
+            generation = self.generation
+
+        if lookups:
+            missing = [pairs[i] for i in lookups]
+            if hasattr(self.store, 'get_exchange_rates'):
+                found = self.store.get_exchange_rates(missing)
+            else:
+                found = [self.store.get_exchange_rate(*pair) for pair in missing]
+            for i, rate in zip(lookups, found):
+                rates[i] = rate
+                self._set(self._get_key(*pairs[i]), rate, generation)
+        return rates
+
 exchange_rates = ExchangeRates(store=MemoryExchangeRates())
 add_exchange_rate = exchange_rates.add_exchange_rate
 remove_exchange_rate = exchange_rates.remove_exchange_rate
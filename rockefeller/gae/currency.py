@@ -13,3 +13,21 @@ class GAECurrency(object):
 
     def get(self, code):
         return self.model.get(code)
+
+    def get_many(self, codes):
+        return self.model.get_many(codes)
+
+    def get_by_numeric(self, numeric):
+        return self.model.get_by_numeric(numeric)
+
+    def find_by_symbol(self, symbol):
+        return self.model.find_by_symbol(symbol)
+
+    def support_async(self, currency):
+        return self.model.support_async(currency)
+
+    def not_support_async(self, currency):
+        return self.model.not_support_async(currency)
+
+    def get_async(self, code):
+        return self.model.get_async(code)
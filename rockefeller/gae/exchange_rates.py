@@ -19,3 +19,26 @@ class GAEExchangeRates(object):
         else:
             rate = self.model.get_exchange_rate(base_currency, currency)
         return rate
+
+    def get_exchange_rates(self, pairs):
+        return self.model.get_exchange_rates(pairs)
+
+    def add_exchange_rate_async(self, base_currency, currency, exchange_rate):
+        return self.model.add_exchange_rate_async(base_currency, currency,
+                                                  exchange_rate)
+
+    def add_exchange_rates(self, rates):
+        self.model.add_exchange_rates(rates)
+
+    def add_exchange_rates_async(self, rates):
+        return self.model.add_exchange_rates_async(rates)
+
+    def remove_exchange_rate_async(self, base_currency, currency):
+        return self.model.remove_exchange_rates_async(
+            [(base_currency, currency), (currency, base_currency)])
+
+    def get_exchange_rate_async(self, base_currency, currency):
+        return self.model.get_exchange_rate_async(base_currency, currency)
+
+    def get_exchange_rates_async(self, pairs):
+        return self.model.get_exchange_rates_async(pairs)
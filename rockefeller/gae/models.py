@@ -1,3 +1,5 @@
+import decimal
+
 from google.appengine.ext import ndb
 from .. import currency
 
@@ -13,22 +15,63 @@ class Currency(ndb.Model):
     def get_key(cls, code):
         return ndb.Key(cls, code)
 
+    def to_currency(self):
+        return currency.intern_currency(currency.Currency(**self.to_dict()))
+
     @classmethod
     def get(cls, code):
         obj = cls.get_key(code).get()
         if obj:
-            return currency.Currency(**obj.to_dict())
+            return obj.to_currency()
+        return None
+
+    @classmethod
+    @ndb.tasklet
+    def get_async(cls, code):
+        obj = yield cls.get_key(code).get_async()
+        if obj:
+            raise ndb.Return(obj.to_currency())
+        raise ndb.Return(None)
+
+    @classmethod
+    def get_many(cls, codes):
+        objs = ndb.get_multi([cls.get_key(code) for code in codes])
+        return [obj.to_currency() if obj else None for obj in objs]
+
+    @classmethod
+    def get_by_numeric(cls, numeric):
+        numeric = currency._to_numeric(numeric)
+        if numeric is None:
+            return None
+        obj = cls.query(cls.numeric == numeric).get()
+        if obj:
+            return obj.to_currency()
         return None
 
+    @classmethod
+    def find_by_symbol(cls, symbol):
+        objs = cls.query(cls.symbol == symbol).fetch()
+        return sorted((obj.to_currency() for obj in objs),
+                      key=lambda obj: obj.code)
+
     @classmethod
     def support(cls, currency):
         obj = cls(key=cls.get_key(currency.code), **currency._asdict())
         obj.put()
 
+    @classmethod
+    def support_async(cls, currency):
+        obj = cls(key=cls.get_key(currency.code), **currency._asdict())
+        return obj.put_async()
+
     @classmethod
     def not_support(cls, currency):
         cls.get_key(currency.code).delete()
 
+    @classmethod
+    def not_support_async(cls, currency):
+        return cls.get_key(currency.code).delete_async()
+
 
 class ExchangeRate(ndb.Model):
     base_currency = ndb.StringProperty(required=True)
@@ -40,20 +83,95 @@ class ExchangeRate(ndb.Model):
         key = '{}_{}'.format(hash(base_currency), hash(currency))
         return ndb.Key(cls, key)
 
+    @classmethod
+    def create(cls, base_currency, currency, exchange_rate):
+        return cls(key=cls.get_key(base_currency, currency),
+                   base_currency=base_currency.code, currency=currency.code,
+                   exchange_rate=exchange_rate)
+
     @classmethod
     def add_exchange_rate(cls, base_currency, currency, exchange_rate):
-        obj = cls(key=cls.get_key(base_currency, currency),
-                  base_currency=base_currency.code, currency=currency.code,
-                  exchange_rate=exchange_rate)
+        obj = cls.create(base_currency, currency, exchange_rate)
         obj.put()
 
+    @classmethod
+    def add_exchange_rate_async(cls, base_currency, currency, exchange_rate):
+        obj = cls.create(base_currency, currency, exchange_rate)
+        return obj.put_async()
+
+    @classmethod
+    def add_exchange_rates(cls, rates):
+        ndb.put_multi([cls.create(*rate) for rate in rates])
+
+    @classmethod
+    @ndb.tasklet
+    def add_exchange_rates_async(cls, rates):
+        keys = yield ndb.put_multi_async([cls.create(*rate) for rate in rates])
+        raise ndb.Return(keys)
+
     @classmethod
     def remove_exchange_rate(cls, base_currency, currency):
         cls.get_key(base_currency, currency).delete()
 
+    @classmethod
+    def remove_exchange_rate_async(cls, base_currency, currency):
+        return cls.get_key(base_currency, currency).delete_async()
+
+    @classmethod
+    def remove_exchange_rates(cls, pairs):
+        ndb.delete_multi([cls.get_key(*pair) for pair in pairs])
+
+    @classmethod
+    @ndb.tasklet
+    def remove_exchange_rates_async(cls, pairs):
+        yield ndb.delete_multi_async([cls.get_key(*pair) for pair in pairs])
+
     @classmethod
     def get_exchange_rate(cls, base_currency, currency):
+        if base_currency == currency:
+            return decimal.Decimal(1)
         obj = cls.get_key(base_currency, currency).get()
         if obj:
             return obj.exchange_rate
         return None
+
+    @classmethod
+    @ndb.tasklet
+    def get_exchange_rate_async(cls, base_currency, currency):
+        if base_currency == currency:
+            raise ndb.Return(decimal.Decimal(1))
+        obj = yield cls.get_key(base_currency, currency).get_async()
+        raise ndb.Return(obj.exchange_rate if obj else None)
+
+    @classmethod
+    def _get_keys(cls, pairs):
+        return [cls.get_key(base_currency, currency)
+                for base_currency, currency in pairs
+                if base_currency != currency]
+
+    @staticmethod
+    def _get_rates(pairs, objs):
+        """Merge the entities of the keys built by ``_get_keys`` with the
+        pairs of the same currency.
+        """
+        objs = iter(objs)
+        rates = []
+        for base_currency, currency in pairs:
+            if base_currency == currency:
+                rates.append(decimal.Decimal(1))
+            else:
+                obj = next(objs)
+                rates.append(obj.exchange_rate if obj else None)
+        return rates
+
+    @classmethod
+    def get_exchange_rates(cls, pairs):
+        pairs = list(pairs)
+        return cls._get_rates(pairs, ndb.get_multi(cls._get_keys(pairs)))
+
+    @classmethod
+    @ndb.tasklet
+    def get_exchange_rates_async(cls, pairs):
+        pairs = list(pairs)
+        objs = yield ndb.get_multi_async(cls._get_keys(pairs))
+        raise ndb.Return(cls._get_rates(pairs, objs))
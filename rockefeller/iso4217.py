@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""ISO 4217 currencies.
+
+``CURRENCIES`` maps every alpha code to a ``(name, numeric, exponent,
+symbol)`` tuple. Codes without minor unit (precious metals, bond market
+units, SDR and the testing codes) aren't included.
+"""
+
+CURRENCIES = {
+    'AED': (u'UAE Dirham', 784, 2, u'د.إ'),
+    'AFN': (u'Afghani', 971, 2, u'؋'),
+    'ALL': (u'Lek', 8, 2, u'L'),
+    'AMD': (u'Armenian Dram', 51, 2, u'֏'),
+    'ANG': (u'Netherlands Antillean Guilder', 532, 2, u'ƒ'),
+    'AOA': (u'Kwanza', 973, 2, u'Kz'),
+    'ARS': (u'Argentine Peso', 32, 2, u'$'),
+    'AUD': (u'Australian Dollar', 36, 2, u'$'),
+    'AWG': (u'Aruban Florin', 533, 2, u'ƒ'),
+    'AZN': (u'Azerbaijan Manat', 944, 2, u'₼'),
+    'BAM': (u'Convertible Mark', 977, 2, u'KM'),
+    'BBD': (u'Barbados Dollar', 52, 2, u'$'),
+    'BDT': (u'Taka', 50, 2, u'৳'),
+    'BGN': (u'Bulgarian Lev', 975, 2, u'лв'),
+    'BHD': (u'Bahraini Dinar', 48, 3, u'.د.ب'),
+    'BIF': (u'Burundi Franc', 108, 0, u'FBu'),
+    'BMD': (u'Bermudian Dollar', 60, 2, u'$'),
+    'BND': (u'Brunei Dollar', 96, 2, u'$'),
+    'BOB': (u'Boliviano', 68, 2, u'Bs.'),
+    'BOV': (u'Mvdol', 984, 2, u''),
+    'BRL': (u'Brazilian Real', 986, 2, u'R$'),
+    'BSD': (u'Bahamian Dollar', 44, 2, u'$'),
+    'BTN': (u'Ngultrum', 64, 2, u'Nu.'),
+    'BWP': (u'Pula', 72, 2, u'P'),
+    'BYN': (u'Belarusian Ruble', 933, 2, u'Br'),
+    'BZD': (u'Belize Dollar', 84, 2, u'$'),
+    'CAD': (u'Canadian Dollar', 124, 2, u'$'),
+    'CDF': (u'Congolese Franc', 976, 2, u'FC'),
+    'CHE': (u'WIR Euro', 947, 2, u''),
+    'CHF': (u'Swiss Franc', 756, 2, u'Fr.'),
+    'CHW': (u'WIR Franc', 948, 2, u''),
+    'CLF': (u'Unidad de Fomento', 990, 4, u''),
+    'CLP': (u'Chilean Peso', 152, 0, u'$'),
+    'CNY': (u'Yuan Renminbi', 156, 2, u'¥'),
+    'COP': (u'Colombian Peso', 170, 2, u'$'),
+    'COU': (u'Unidad de Valor Real', 970, 2, u''),
+    'CRC': (u'Costa Rican Colon', 188, 2, u'₡'),
+    'CUC': (u'Peso Convertible', 931, 2, u'$'),
+    'CUP': (u'Cuban Peso', 192, 2, u'$'),
+    'CVE': (u'Cabo Verde Escudo', 132, 2, u'$'),
+    'CZK': (u'Czech Koruna', 203, 2, u'Kč'),
+    'DJF': (u'Djibouti Franc', 262, 0, u'Fdj'),
+    'DKK': (u'Danish Krone', 208, 2, u'kr'),
+    'DOP': (u'Dominican Peso', 214, 2, u'$'),
+    'DZD': (u'Algerian Dinar', 12, 2, u'د.ج'),
+    'EGP': (u'Egyptian Pound', 818, 2, u'£'),
+    'ERN': (u'Nakfa', 232, 2, u'Nfk'),
+    'ETB': (u'Ethiopian Birr', 230, 2, u'Br'),
+    'EUR': (u'Euro', 978, 2, u'€'),
+    'FJD': (u'Fiji Dollar', 242, 2, u'$'),
+    'FKP': (u'Falkland Islands Pound', 238, 2, u'£'),
+    'GBP': (u'Pound Sterling', 826, 2, u'£'),
+    'GEL': (u'Lari', 981, 2, u'₾'),
+    'GHS': (u'Ghana Cedi', 936, 2, u'₵'),
+    'GIP': (u'Gibraltar Pound', 292, 2, u'£'),
+    'GMD': (u'Dalasi', 270, 2, u'D'),
+    'GNF': (u'Guinean Franc', 324, 0, u'FG'),
+    'GTQ': (u'Quetzal', 320, 2, u'Q'),
+    'GYD': (u'Guyana Dollar', 328, 2, u'$'),
+    'HKD': (u'Hong Kong Dollar', 344, 2, u'$'),
+    'HNL': (u'Lempira', 340, 2, u'L'),
+    'HRK': (u'Kuna', 191, 2, u'kn'),
+    'HTG': (u'Gourde', 332, 2, u'G'),
+    'HUF': (u'Forint', 348, 2, u'Ft'),
+    'IDR': (u'Rupiah', 360, 2, u'Rp'),
+    'ILS': (u'New Israeli Sheqel', 376, 2, u'₪'),
+    'INR': (u'Indian Rupee', 356, 2, u'₹'),
+    'IQD': (u'Iraqi Dinar', 368, 3, u'ع.د'),
+    'IRR': (u'Iranian Rial', 364, 2, u'﷼'),
+    'ISK': (u'Iceland Krona', 352, 0, u'kr'),
+    'JMD': (u'Jamaican Dollar', 388, 2, u'$'),
+    'JOD': (u'Jordanian Dinar', 400, 3, u'د.ا'),
+    'JPY': (u'Yen', 392, 0, u'¥'),
+    'KES': (u'Kenyan Shilling', 404, 2, u'KSh'),
+    'KGS': (u'Som', 417, 2, u'с'),
+    'KHR': (u'Riel', 116, 2, u'៛'),
+    'KMF': (u'Comorian Franc', 174, 0, u'CF'),
+    'KPW': (u'North Korean Won', 408, 2, u'₩'),
+    'KRW': (u'Won', 410, 0, u'₩'),
+    'KWD': (u'Kuwaiti Dinar', 414, 3, u'د.ك'),
+    'KYD': (u'Cayman Islands Dollar', 136, 2, u'$'),
+    'KZT': (u'Tenge', 398, 2, u'₸'),
+    'LAK': (u'Lao Kip', 418, 2, u'₭'),
+    'LBP': (u'Lebanese Pound', 422, 2, u'ل.ل'),
+    'LKR': (u'Sri Lanka Rupee', 144, 2, u'Rs'),
+    'LRD': (u'Liberian Dollar', 430, 2, u'$'),
+    'LSL': (u'Loti', 426, 2, u'L'),
+    'LYD': (u'Libyan Dinar', 434, 3, u'ل.د'),
+    'MAD': (u'Moroccan Dirham', 504, 2, u'د.م.'),
+    'MDL': (u'Moldovan Leu', 498, 2, u'L'),
+    'MGA': (u'Malagasy Ariary', 969, 2, u'Ar'),
+    'MKD': (u'Denar', 807, 2, u'ден'),
+    'MMK': (u'Kyat', 104, 2, u'K'),
+    'MNT': (u'Tugrik', 496, 2, u'₮'),
+    'MOP': (u'Pataca', 446, 2, u'MOP$'),
+    'MRU': (u'Ouguiya', 929, 2, u'UM'),
+    'MUR': (u'Mauritius Rupee', 480, 2, u'₨'),
+    'MVR': (u'Rufiyaa', 462, 2, u'Rf'),
+    'MWK': (u'Malawi Kwacha', 454, 2, u'MK'),
+    'MXN': (u'Mexican Peso', 484, 2, u'$'),
+    'MXV': (u'Mexican Unidad de Inversion (UDI)', 979, 2, u''),
+    'MYR': (u'Malaysian Ringgit', 458, 2, u'RM'),
+    'MZN': (u'Mozambique Metical', 943, 2, u'MT'),
+    'NAD': (u'Namibia Dollar', 516, 2, u'$'),
+    'NGN': (u'Naira', 566, 2, u'₦'),
+    'NIO': (u'Cordoba Oro', 558, 2, u'C$'),
+    'NOK': (u'Norwegian Krone', 578, 2, u'kr'),
+    'NPR': (u'Nepalese Rupee', 524, 2, u'₨'),
+    'NZD': (u'New Zealand Dollar', 554, 2, u'$'),
+    'OMR': (u'Rial Omani', 512, 3, u'ر.ع.'),
+    'PAB': (u'Balboa', 590, 2, u'B/.'),
+    'PEN': (u'Sol', 604, 2, u'S/'),
+    'PGK': (u'Kina', 598, 2, u'K'),
+    'PHP': (u'Philippine Peso', 608, 2, u'₱'),
+    'PKR': (u'Pakistan Rupee', 586, 2, u'₨'),
+    'PLN': (u'Zloty', 985, 2, u'zł'),
+    'PYG': (u'Guarani', 600, 0, u'₲'),
+    'QAR': (u'Qatari Rial', 634, 2, u'ر.ق'),
+    'RON': (u'Romanian Leu', 946, 2, u'lei'),
+    'RSD': (u'Serbian Dinar', 941, 2, u'дин.'),
+    'RUB': (u'Russian Ruble', 643, 2, u'₽'),
+    'RWF': (u'Rwanda Franc', 646, 0, u'FRw'),
+    'SAR': (u'Saudi Riyal', 682, 2, u'﷼'),
+    'SBD': (u'Solomon Islands Dollar', 90, 2, u'$'),
+    'SCR': (u'Seychelles Rupee', 690, 2, u'₨'),
+    'SDG': (u'Sudanese Pound', 938, 2, u'ج.س.'),
+    'SEK': (u'Swedish Krona', 752, 2, u'kr'),
+    'SGD': (u'Singapore Dollar', 702, 2, u'$'),
+    'SHP': (u'Saint Helena Pound', 654, 2, u'£'),
+    'SLE': (u'Leone', 925, 2, u'Le'),
+    'SLL': (u'Leone', 694, 2, u'Le'),
+    'SOS': (u'Somali Shilling', 706, 2, u'Sh'),
+    'SRD': (u'Surinam Dollar', 968, 2, u'$'),
+    'SSP': (u'South Sudanese Pound', 728, 2, u'£'),
+    'STN': (u'Dobra', 930, 2, u'Db'),
+    'SVC': (u'El Salvador Colon', 222, 2, u'₡'),
+    'SYP': (u'Syrian Pound', 760, 2, u'£'),
+    'SZL': (u'Lilangeni', 748, 2, u'L'),
+    'THB': (u'Baht', 764, 2, u'฿'),
+    'TJS': (u'Somoni', 972, 2, u'SM'),
+    'TMT': (u'Turkmenistan New Manat', 934, 2, u'm'),
+    'TND': (u'Tunisian Dinar', 788, 3, u'د.ت'),
+    'TOP': (u'Pa’anga', 776, 2, u'T$'),
+    'TRY': (u'Turkish Lira', 949, 2, u'₺'),
+    'TTD': (u'Trinidad and Tobago Dollar', 780, 2, u'$'),
+    'TWD': (u'New Taiwan Dollar', 901, 2, u'NT$'),
+    'TZS': (u'Tanzanian Shilling', 834, 2, u'TSh'),
+    'UAH': (u'Hryvnia', 980, 2, u'₴'),
+    'UGX': (u'Uganda Shilling', 800, 0, u'USh'),
+    'USD': (u'US Dollar', 840, 2, u'$'),
+    'USN': (u'US Dollar (Next day)', 997, 2, u''),
+    'UYI': (u'Uruguay Peso en Unidades Indexadas (UI)', 940, 0, u''),
+    'UYU': (u'Peso Uruguayo', 858, 2, u'$'),
+    'UYW': (u'Unidad Previsional', 927, 4, u''),
+    'UZS': (u'Uzbekistan Sum', 860, 2, u"so'm"),
+    'VED': (u'Bolívar Soberano', 926, 2, u'Bs.D'),
+    'VES': (u'Bolívar Soberano', 928, 2, u'Bs.S'),
+    'VND': (u'Dong', 704, 0, u'₫'),
+    'VUV': (u'Vatu', 548, 0, u'VT'),
+    'WST': (u'Tala', 882, 2, u'T'),
+    'XAF': (u'CFA Franc BEAC', 950, 0, u'FCFA'),
+    'XCD': (u'East Caribbean Dollar', 951, 2, u'$'),
+    'XOF': (u'CFA Franc BCEAO', 952, 0, u'CFA'),
+    'XPF': (u'CFP Franc', 953, 0, u'₣'),
+    'YER': (u'Yemeni Rial', 886, 2, u'﷼'),
+    'ZAR': (u'Rand', 710, 2, u'R'),
+    'ZMW': (u'Zambian Kwacha', 967, 2, u'ZK'),
+    'ZWL': (u'Zimbabwe Dollar', 932, 2, u'$'),
+}
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Incremental JSON parsing with bounded memory."""
+import codecs
+import decimal
+import json
+import re
+
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<punctuation>[{}\[\]:,])
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)
+      | (?P<literal>true|false|null)
+    )''', re.VERBOSE)
+
+_LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+def _iter_tokens(fp, chunk_size, parse_float):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    eof = False
+    while True:
+        match = _TOKEN.match(buffer, position)
+        # A number close to the end of the buffer may continue in the next
+        # chunk: "1" may be "1.5", "1." and "1e" aren't matched as a whole.
+        if match is None or (match.lastgroup == 'number' and not eof and
+                             match.end() + 2 >= len(buffer)):
+            if eof:
+                if buffer[position:].strip():
+                    raise ValueError('Invalid JSON: {!r}'.format(
+                        buffer[position:position + 20]))
+                return
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                eof = True
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk, final=eof)
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        position = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == 'string':
+            yield kind, json.loads(token)
+        elif kind == 'number':
+            if '.' in token or 'e' in token or 'E' in token:
+                yield kind, parse_float(token)
+            else:
+                yield kind, int(token)
+        elif kind == 'literal':
+            yield kind, _LITERALS[token]
+        else:
+            yield kind, token
+
+
+def iter_json(fp, chunk_size=65536, parse_float=decimal.Decimal):
+    """Parse a JSON document while it's read.
+
+    Only the values that aren't objects or arrays are yielded, together with
+    their path in the document. For example ``{"rates": {"EUR": 0.78}}``
+    yields ``(('rates', 'EUR'), Decimal('0.78'))``. Array items have their
+    index in the path.
+
+    The parser is lenient: it doesn't validate the structure of the document.
+
+    :param fp: File-like object returning :class:`bytes` or text from its
+        ``read`` method.
+    :param chunk_size: Number of bytes read at a time.
+    :param parse_float: Function used for parsing numbers with a fraction or
+        exponent. Defaults to :class:`decimal.Decimal`.
+
+    :return: Generator object. Each yielded value is a ``(path, value)``
+        tuple.
+    """
+    path = []
+    containers = []
+    expect_key = False
+    for kind, value in _iter_tokens(fp, chunk_size, parse_float):
+        if kind == 'punctuation':
+            if value == '{':
+                containers.append(value)
+                path.append(None)
+                expect_key = True
+            elif value == '[':
+                containers.append(value)
+                path.append(0)
+            elif value in '}]':
+                containers.pop()
+                path.pop()
+                expect_key = False
+            elif value == ',':
+                if containers[-1] == '{':
+                    expect_key = True
+                else:
+                    path[-1] += 1
+        elif expect_key:
+            path[-1] = value
+            expect_key = False
+        else:
+            yield tuple(path), value
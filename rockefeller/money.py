@@ -1,12 +1,56 @@
 # -*- coding: utf-8 -*-
 from __future__ import division
 import decimal
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
-from six import PY3
+from six import PY3, integer_types
 
 from .exchange_rates import get_exchange_rate
 from .exceptions import ExchangeError, MoneyError
+from .utils import decimal_context, exact_context
+
+
+_quantizers = {}
+# Wide enough for quantizing any amount, unlike the context of the thread.
+_rounding_context = exact_context.copy()
+_rounding_context.traps[decimal.Inexact] = False
+
+
+def _check_range(amount):
+    """Reject amounts whose magnitude is out of the exponent limits of the
+    exact context before working with them, as exact results could take
+    up to one digit per unit of exponent.
+    """
+    if not exact_context.Emin <= amount.adjusted() <= exact_context.Emax:
+        raise MoneyError('Amount {} is out of range.'.format(amount))
+
+
+def _add_amounts(amount, other):
+    _check_range(amount)
+    _check_range(other)
+    return exact_context.add(amount, other)
+
+
+def _subtract_amounts(amount, other):
+    _check_range(amount)
+    _check_range(other)
+    return exact_context.subtract(amount, other)
+
+
+def get_quantizer(exponent):
+    """Get the decimal used for quantizing amounts to ``exponent`` digits
+    after the decimal separator. Quantizers are built once per exponent.
+
+    :param exponent: Number of digits after the decimal separator.
+
+    :return: :class:`~decimal.Decimal` number.
+    """
+    try:
+        return _quantizers[exponent]
+    except KeyError:
+        quantizer = decimal.Decimal('1.' + '0' * exponent)
+        _quantizers[exponent] = quantizer
+        return quantizer
 
 
 def round_amount(amount, currency):
@@ -18,14 +62,18 @@ def round_amount(amount, currency):
     :return: Rounded amount as a :class:`~decimal.Decimal` number.
 
     :raises: :class:`~rockefeller.exceptions.MoneyError` if an invalid currency
-        is supplied.
+        is supplied or the amount is out of range.
     """
     try:
         exponent = currency.exponent
     except AttributeError:
         raise MoneyError('Wrong currency `{!r}` for money.'.format(currency))
-    exponent = '1.' + '0' * currency.exponent
-    return amount.quantize(decimal.Decimal(exponent), rounding=decimal.ROUND_HALF_UP)
+    _check_range(amount)
+    try:
+        quantizer = _quantizers[exponent]
+    except KeyError:
+        quantizer = get_quantizer(exponent)
+    return amount.quantize(quantizer, decimal.ROUND_HALF_UP, _rounding_context)
 
 
 def to_decimal(value):
@@ -40,13 +88,335 @@ def to_decimal(value):
     return value
 
 
+def to_units(amount, exponent):
+    """Convert an amount into an integer number of units scaled by
+    ``10 ** exponent``.
+
+    :param amount: :class:`~decimal.Decimal` number.
+    :param exponent: Number of digits after the decimal separator.
+
+    :return: Scaled amount as an ``int``.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if ``amount`` can't be
+        represented exactly with ``exponent`` digits or is out of range.
+    """
+    _check_range(amount)
+    scaled = amount.scaleb(exponent, exact_context)
+    if not scaled.is_finite():
+        raise MoneyError('Amount {} is not finite.'.format(amount))
+    units = int(scaled)
+    if units != scaled:
+        raise MoneyError('Amount {} has more than {} decimal digits.'.format(
+            amount, exponent))
+    return units
+
+
+def from_units(units, exponent):
+    """Convert an integer number of units scaled by ``10 ** exponent`` back
+    into an amount.
+
+    :param units: Scaled amount as an ``int``.
+    :param exponent: Number of digits after the decimal separator.
+
+    :return: :class:`~decimal.Decimal` number.
+    """
+    return decimal.Decimal(units).scaleb(-exponent, exact_context)
+
+
+def get_places(amount):
+    """Get the number of digits after the decimal separator of an amount.
+
+    :param amount: :class:`~decimal.Decimal` number.
+
+    :return: Number of decimal digits as an ``int``.
+    """
+    exponent = amount.as_tuple().exponent
+    if isinstance(exponent, int) and exponent < 0:
+        return -exponent
+    return 0
+
+
 def _check_operand(operation, operand):
-    if not isinstance(operand, Money):
+    if not isinstance(operand, (Money, FixedMoney)):
         msg = "unsupported operand type(s) for %s: 'Money' and '%r'" % (
             operation, operand.__class__)
         raise TypeError(msg)
 
 
+def _get_exchange_rate(base_currency, currency, indirection_currency=None):
+    rate = get_exchange_rate(base_currency, currency)
+    if rate is None:
+        if not indirection_currency and Money.indirection_currency:
+            indirection_currency = Money.indirection_currency
+        rate_from_base = get_exchange_rate(base_currency, indirection_currency)
+        rate_base_to = get_exchange_rate(indirection_currency, currency)
+        if rate_from_base and rate_base_to:
+            rate = decimal_context.multiply(rate_from_base, rate_base_to)
+
+    return rate
+
+
+def exchange_many(moneys, currency, indirection_currency=None):
+    """Convert several moneys into money of another currency.
+
+    The exchange rate of each source currency is looked up just once no matter
+    how many moneys share it.
+
+    :param moneys: Iterable of :class:`~rockefeller.money.Money` objects.
+    :param currency: Convert the moneys into this currency.
+        :class:`~rockefeller.currency.Currency` instance.
+    :param indirection_currency: Use this currency as the indirection
+        currency. :class:`~rockefeller.currency.Currency` instance.
+
+    :return: List of :class:`~rockefeller.money.Money` objects in ``currency``
+        currency, in the same order as ``moneys``.
+
+    :raises: :class:`~rockefeller.exceptions.ExchangeError`
+        if Exchange rate bettween currencies is not defined.
+    """
+    rates = {}
+    results = []
+    append = results.append
+    make = Money._make
+    for money in moneys:
+        base_currency = money.currency
+        try:
+            rate = rates[base_currency]
+        except KeyError:
+            rate = _get_exchange_rate(base_currency, currency,
+                                      indirection_currency)
+            if rate is None:
+                raise ExchangeError('Exchange rate {}-{} not defined.'.format(
+                    base_currency, currency))
+            rate = rates[base_currency] = to_decimal(rate)
+        amount = decimal_context.multiply(money.amount, rate)
+        append(make((round_amount(amount, currency), currency)))
+
+    return results
+
+
+def _accumulate(moneys):
+    """Add up amounts per currency.
+
+    :return: :class:`~collections.OrderedDict` mapping currencies to an
+        ``[amount, units, fixed]`` list: the sum of the amounts of
+        :class:`~rockefeller.money.Money` objects, the sum of the units of
+        :class:`~rockefeller.money.FixedMoney` objects and whether or not all
+        of them were fixed.
+    """
+    totals = OrderedDict()
+    currency = total = None
+    for money in moneys:
+        cls = money.__class__
+        if cls is not Money and cls is not FixedMoney:
+            _check_operand('+', money)
+        if money.currency is not currency:
+            currency = money.currency
+            total = totals.get(currency)
+            if total is None:
+                total = totals[currency] = [decimal.Decimal(0), 0, True]
+        if cls is Money or not isinstance(money, FixedMoney):
+            total[0] = _add_amounts(total[0], money.amount)
+            total[2] = False
+        else:
+            total[1] += money.units
+    return totals
+
+
+def _make_total(currency, amount, units, fixed):
+    if fixed:
+        return FixedMoney.from_units(units, currency)
+    if units:
+        amount = _add_amounts(amount, from_units(units, currency.exponent))
+    return Money(amount, currency)
+
+
+def sum_money(moneys, currency=None):
+    """Add up moneys of the same currency.
+
+    Amounts are accumulated as decimals, and units of
+    :class:`~rockefeller.money.FixedMoney` objects as integers, without
+    building a money object per step.
+
+    :param moneys: Iterable of :class:`~rockefeller.money.Money` or
+        :class:`~rockefeller.money.FixedMoney` objects.
+    :param currency: Currency of the moneys, required if ``moneys`` is
+        empty. :class:`~rockefeller.currency.Currency` instance.
+
+    :return: :class:`~rockefeller.money.FixedMoney` instance if every money
+        is fixed, :class:`~rockefeller.money.Money` instance otherwise.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if moneys have
+        different currencies.
+    """
+    totals = _accumulate(moneys)
+    if not totals:
+        if currency is None:
+            raise MoneyError('Currency required for an empty sum.')
+        return Money(0, currency)
+    if len(totals) > 1 or (currency is not None and currency not in totals):
+        raise MoneyError('Moneys have different currencies: {}.'.format(
+            ', '.join(str(money_currency) for money_currency in totals)))
+    (currency, total), = totals.items()
+    return _make_total(currency, *total)
+
+
+def totals_by_currency(moneys):
+    """Add up moneys per currency.
+
+    :param moneys: Iterable of :class:`~rockefeller.money.Money` or
+        :class:`~rockefeller.money.FixedMoney` objects.
+
+    :return: :class:`~collections.OrderedDict` mapping each currency, in the
+        order they are found, to the total of its moneys like
+        :func:`~rockefeller.money.sum_money` returns it.
+    """
+    return OrderedDict((currency, _make_total(currency, *total))
+                       for currency, total in _accumulate(moneys).items())
+
+
+def total_in(moneys, currency, indirection_currency=None):
+    """Add up moneys of any currency converting them into one currency.
+
+    Moneys are added up per currency first, so each exchange rate is looked
+    up and applied once. The total is rounded once, at the end, so it can
+    differ from adding up the moneys converted one by one.
+
+    :param moneys: Iterable of :class:`~rockefeller.money.Money` or
+        :class:`~rockefeller.money.FixedMoney` objects.
+    :param currency: Convert the total into this currency.
+        :class:`~rockefeller.currency.Currency` instance.
+    :param indirection_currency: Use this currency as the indirection
+        currency. :class:`~rockefeller.currency.Currency` instance.
+
+    :return: :class:`~rockefeller.money.Money` instance.
+
+    :raises: :class:`~rockefeller.exceptions.ExchangeError`
+        if Exchange rate bettween currencies is not defined.
+    """
+    result = decimal.Decimal(0)
+    for base_currency, (amount, units, _) in _accumulate(moneys).items():
+        if units:
+            amount = _add_amounts(amount, from_units(
+                units, base_currency.exponent))
+        if base_currency != currency:
+            rate = _get_exchange_rate(base_currency, currency,
+                                      indirection_currency)
+            if rate is None:
+                raise ExchangeError('Exchange rate {}-{} not defined.'.format(
+                    base_currency, currency))
+            amount = decimal_context.multiply(amount, to_decimal(rate))
+        result = _add_amounts(result, amount)
+    return Money(round_amount(result, currency), currency)
+
+
+def _get_ratios(ratios):
+    """Convert ratios into integers keeping their proportions.
+
+    :return: ``(ratios, total)`` tuple. ``ratios`` is a list of ``int``.
+
+    :raises: :class:`ValueError` if there are no ratios, any of them is
+        negative or not finite or all of them are zero.
+    """
+    ratios = [to_decimal(ratio) for ratio in ratios]
+    if not ratios:
+        raise ValueError('At least one ratio is required.')
+    if not all(ratio.is_finite() for ratio in ratios):
+        raise ValueError('Ratios must be finite.')
+    if any(ratio < 0 for ratio in ratios):
+        raise ValueError('Ratios must not be negative.')
+    places = max(get_places(ratio) for ratio in ratios)
+    ratios = [to_units(ratio, places) for ratio in ratios]
+    total = sum(ratios)
+    if not total:
+        raise ValueError('Ratios must not be all zero.')
+    return ratios, total
+
+
+def _allocate_units(units, ratios, total):
+    """Distribute an integer number of units proportionally to integer
+    ratios using the largest remainder method. Ties are resolved in favour
+    of the first parts.
+    """
+    sign = -1 if units < 0 else 1
+    units = abs(units)
+    shares = []
+    remainders = []
+    for ratio in ratios:
+        share, remainder = divmod(units * ratio, total)
+        shares.append(share)
+        remainders.append(remainder)
+    left = units - sum(shares)
+    if left:
+        order = sorted(range(len(shares)), key=lambda i: -remainders[i])
+        for i in order[:left]:
+            shares[i] += 1
+    return [sign * share for share in shares]
+
+
+def _get_minor_units(money):
+    if isinstance(money, FixedMoney):
+        return money.units
+    return to_units(money.amount, money.currency.exponent)
+
+
+def allocate(money, ratios):
+    """Distribute money proportionally to some ratios without losing or
+    creating a single minor unit.
+
+    Each part gets its share of minor units rounded down and the units left
+    go one by one to the parts with the largest remainders.
+
+    :param money: :class:`~rockefeller.money.Money` or
+        :class:`~rockefeller.money.FixedMoney` instance. Its amount must not
+        have more digits than its currency exponent, round it first if
+        needed.
+    :param ratios: Iterable of non negative numbers.
+
+    :return: List of moneys of the same class as ``money``, one per ratio.
+        Their sum is ``money``.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if the amount has
+        more digits than the currency exponent.
+    :raises: :class:`ValueError` if ratios are empty, negative, not finite
+        or all zero.
+    """
+    ratios, total = _get_ratios(ratios)
+    shares = _allocate_units(_get_minor_units(money), ratios, total)
+    currency = money.currency
+    if isinstance(money, FixedMoney):
+        return [FixedMoney.from_units(share, currency) for share in shares]
+    exponent = currency.exponent
+    return [Money._make((from_units(share, exponent), currency))
+            for share in shares]
+
+
+def _get_parts(n):
+    """Get the ratios of ``n`` equal parts."""
+    if not isinstance(n, integer_types) or isinstance(n, bool):
+        raise TypeError('Number of parts must be an integer: {!r}.'.format(n))
+    if n < 1:
+        raise ValueError('Number of parts must be positive: {}.'.format(n))
+    return [1] * n
+
+
+def split(money, n):
+    """Split money into ``n`` parts as equal as possible.
+
+    See :func:`~rockefeller.money.allocate`.
+
+    :param money: :class:`~rockefeller.money.Money` or
+        :class:`~rockefeller.money.FixedMoney` instance.
+    :param n: Number of parts. Positive ``int``.
+
+    :return: List of ``n`` moneys, the first ones get the units left.
+
+    :raises: :class:`TypeError` if ``n`` isn't an integer.
+    :raises: :class:`ValueError` if ``n`` isn't positive.
+    """
+    return allocate(money, _get_parts(n))
+
+
 class Money(namedtuple('Money', 'amount currency')):
     """Representation of money.
 
@@ -67,29 +437,42 @@ class Money(namedtuple('Money', 'amount currency')):
         return super(Money, cls).__new__(cls, to_decimal(amount), currency)
 
     def __eq__(self, other):
-        return (isinstance(other, self.__class__) and
-                self.amount == other.amount and self.currency == other.currency)
+        if not isinstance(other, (self.__class__, FixedMoney)):
+            return False
+        currency = self.currency
+        return (self.amount == other.amount and
+                (currency is other.currency or currency == other.currency))
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
 
     def __add__(self, other):
         _check_operand('+', other)
-        return Money(self.amount + other.amount, self.currency)
+        return Money(_add_amounts(self.amount, other.amount),
+                     self.currency)
 
     def __sub__(self, other):
         _check_operand('-', other)
-        return Money(self.amount - other.amount, self.currency)
+        return Money(_subtract_amounts(self.amount, other.amount),
+                     self.currency)
 
     def __mul__(self, other):
         _check_operand('*', other)
-        return Money(self.amount * other.amount, self.currency)
+        return Money(decimal_context.multiply(self.amount, other.amount),
+                     self.currency)
+    __rmul__ = __mul__
 
     def __div__(self, other):
         _check_operand('/', other)
-        return Money(self.amount / other.amount, self.currency)
+        return Money(decimal_context.divide(self.amount, other.amount),
+                     self.currency)
     __floordiv__ = __div__
     __truediv__ = __div__
 
     def __divmod__(self, other):
-        quotient, remainder = divmod(self.amount, other.amount)
+        quotient, remainder = decimal_context.divmod(self.amount, other.amount)
         return Money(quotient, self.currency), Money(remainder, self.currency)
 
     def __float__(self):
@@ -125,16 +508,7 @@ class Money(namedtuple('Money', 'amount currency')):
 
         :return: Exchange rate as a ``decimal`` if found, else ``None``.
         """
-        rate = get_exchange_rate(self.currency, currency)
-        if rate is None:
-            if not indirection_currency and Money.indirection_currency:
-                indirection_currency = Money.indirection_currency
-            rate_from_base = get_exchange_rate(self.currency, indirection_currency)
-            rate_base_to = get_exchange_rate(indirection_currency, currency)
-            if rate_from_base and rate_base_to:
-                rate = rate_from_base * rate_base_to
-
-        return rate
+        return _get_exchange_rate(self.currency, currency, indirection_currency)
 
     @property
     def rounded_amount(self):
@@ -167,5 +541,168 @@ class Money(namedtuple('Money', 'amount currency')):
             raise ExchangeError('Exchange rate {}-{} not defined.'.format(
                 self.currency, currency))
 
-        amount = round_amount(self.amount * exchange_rate, currency)
-        return self.__class__(amount=amount, currency=currency)
+        amount = decimal_context.multiply(self.amount, exchange_rate)
+        return self.__class__(amount=round_amount(amount, currency),
+                              currency=currency)
+
+
+class FixedMoney(namedtuple('FixedMoney', 'units currency')):
+    """Representation of money as an integer number of currency minor units.
+
+    Addition, subtraction and comparison between `FixedMoney` objects of the
+    same currency are done with plain integers, the amount is only built as a
+    :class:`~decimal.Decimal` value when asked for.
+
+    Initialization params:
+
+        `amount`
+            Amount of money. It must not have more digits after the decimal
+            separator than the currency exponent.
+
+        `currency`
+            Money currency. :class:`~rockefeller.currency.Currency` instance.
+
+    :raises: :class:`~rockefeller.exceptions.MoneyError` if ``amount`` can't be
+        represented exactly in minor units of ``currency``.
+    """
+    def __new__(cls, amount, currency):
+        try:
+            exponent = currency.exponent
+        except AttributeError:
+            raise MoneyError('Wrong currency `{!r}` for money.'.format(currency))
+        units = to_units(to_decimal(amount), exponent)
+        return super(FixedMoney, cls).__new__(cls, units, currency)
+
+    def __getnewargs__(self):
+        return self.amount, self.currency
+
+    @classmethod
+    def from_units(cls, units, currency):
+        """Create money from an integer number of minor units.
+
+        :param units: Amount in minor units of ``currency``. As an ``int``.
+        :param currency: :class:`~rockefeller.currency.Currency` instance.
+
+        :return: :class:`~rockefeller.money.FixedMoney` instance.
+        """
+        return cls._make((units, currency))
+
+    @classmethod
+    def from_money(cls, money):
+        """Create fixed-point money from a :class:`~rockefeller.money.Money`
+        object.
+
+        :raises: :class:`~rockefeller.exceptions.MoneyError` if the amount of
+            ``money`` has more digits than its currency exponent.
+        """
+        return cls(money.amount, money.currency)
+
+    def to_money(self):
+        """Convert into a :class:`~rockefeller.money.Money` object."""
+        return Money._make((self.amount, self.currency))
+
+    @property
+    def amount(self):
+        return from_units(self.units, self.currency.exponent)
+
+    rounded_amount = amount
+
+    def _get_units(self, operation, other):
+        """Get the units of ``other`` if it's fixed-point money of the same
+        currency, else ``None``.
+        """
+        _check_operand(operation, other)
+        if isinstance(other, FixedMoney):
+            if other.currency != self.currency:
+                raise MoneyError('Currencies differ: {} and {}.'.format(
+                    self.currency, other.currency))
+            return other.units
+        return None
+
+    def __eq__(self, other):
+        if isinstance(other, FixedMoney):
+            return self.units == other.units and self.currency == other.currency
+        return (isinstance(other, Money) and
+                self.amount == other.amount and self.currency == other.currency)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        # Equal to the hash of the Money objects it is equal to.
+        return hash((self.amount, self.currency))
+
+    def __lt__(self, other):
+        units = self._get_units('<', other)
+        if units is None:
+            return self.amount < other.amount
+        return self.units < units
+
+    def __le__(self, other):
+        units = self._get_units('<=', other)
+        if units is None:
+            return self.amount <= other.amount
+        return self.units <= units
+
+    def __gt__(self, other):
+        units = self._get_units('>', other)
+        if units is None:
+            return self.amount > other.amount
+        return self.units > units
+
+    def __ge__(self, other):
+        units = self._get_units('>=', other)
+        if units is None:
+            return self.amount >= other.amount
+        return self.units >= units
+
+    def __add__(self, other):
+        units, currency = self
+        if other.__class__ is self.__class__ and other[1] is currency:
+            return tuple.__new__(self.__class__, (units + other[0], currency))
+        other_units = self._get_units('+', other)
+        if other_units is None:
+            return Money(_add_amounts(self.amount, other.amount),
+                         currency)
+        return self._make((units + other_units, currency))
+
+    def __sub__(self, other):
+        units, currency = self
+        if other.__class__ is self.__class__ and other[1] is currency:
+            return tuple.__new__(self.__class__, (units - other[0], currency))
+        other_units = self._get_units('-', other)
+        if other_units is None:
+            return Money(_subtract_amounts(self.amount, other.amount),
+                         currency)
+        return self._make((units - other_units, currency))
+
+    def __mul__(self, other):
+        _check_operand('*', other)
+        return self.to_money() * other
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return self._make((-self.units, self.currency))
+
+    def __float__(self):
+        return float(self.amount)
+
+    def __str__(self):
+        return str(self.to_money())
+
+    def __unicode__(self):
+        return self.to_money().__unicode__()
+
+    def exchange_to(self, currency, indirection_currency=None,
+                    exchange_rate=None):
+        """Convert this money into money of another currency.
+
+        See :meth:`rockefeller.money.Money.exchange_to`.
+
+        :return: Money in ``currency`` currency.
+            :class:`~rockefeller.money.FixedMoney` instance.
+        """
+        money = self.to_money().exchange_to(
+            currency, indirection_currency=indirection_currency,
+            exchange_rate=exchange_rate)
+        return self.from_money(money)
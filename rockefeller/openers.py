@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
+import decimal
+import io
 import json
 
 try:
     from urllib.parse import urlencode
-    from urllib.request import build_opener
+    from urllib.request import build_opener, Request
     from urllib.error import HTTPError
 except ImportError:
     from urllib import urlencode
-    from urllib2 import build_opener, HTTPError
+    from urllib2 import build_opener, Request, HTTPError
 
 try:
     import requests
@@ -22,31 +24,111 @@ except ImportError:
 from .utils import LoggingHandler
 
 
-class DefaultOpener(object):
+class NotModified(object):
+    """Type of :data:`NOT_MODIFIED`."""
+    def __repr__(self):
+        return 'NOT_MODIFIED'
+
+
+#: Returned by openers when a conditional request wasn't modified.
+NOT_MODIFIED = NotModified()
+
+
+def get_url(url, params):
+    if not url.endswith('?'):
+        url += '?'
+    return url + urlencode(params)
+
+
+class ConditionalMixin(object):
+    """Remember the ``ETag`` and ``Last-Modified`` headers of the responses
+    per url and build the headers of conditional requests from them.
+    """
+    def __init__(self):
+        self.validators = {}
+
+    def get_conditional_headers(self, url):
+        etag, last_modified = self.validators.get(url, (None, None))
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def remember(self, url, headers):
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if etag or last_modified:
+            self.validators[url] = etag, last_modified
+
+
+class DefaultOpener(ConditionalMixin):
     opener = build_opener(LoggingHandler(__name__))
 
-    def open(self, url, params):
-        if not url.endswith('?'):
-            url += '?'
-        url += urlencode(params)
+    def open(self, url, params, conditional=False):
+        """Make a request and parse the response.
+
+        :param conditional: Defaults to `False`. Whether or not send a
+            conditional request using the validators of the previous
+            response to the same url.
+
+        :return: Response as a dictionary, or :data:`NOT_MODIFIED`.
+        """
+        response = self.open_stream(url, params, conditional=conditional)
+        if response is NOT_MODIFIED:
+            return response
+        return json.load(response, parse_float=decimal.Decimal)
+
+    def open_stream(self, url, params, conditional=False):
+        """Make a request without reading the response.
+
+        :return: File-like object with the response body, or
+            :data:`NOT_MODIFIED`.
+        """
+        url = get_url(url, params)
+        headers = self.get_conditional_headers(url) if conditional else {}
         try:
-            response = self.opener.open(url)
+            response = self.opener.open(Request(url, headers=headers))
         except HTTPError as e:
-            response = e
+            if e.code == 304:
+                return NOT_MODIFIED
+            return e
 
-        return json.load(response)
+        if conditional:
+            self.remember(url, response.headers)
+        return response
 
 
-class GaeOpener(object):
+class GaeOpener(ConditionalMixin):
     def __new__(cls, *args, **kwargs):
         if urlfetch is None:
             raise ImportError('cannot import name urlfetch')
         return object.__new__(cls, *args, **kwargs)
 
-    def open(self, url, params):
-        if not url.endswith('?'):
-            url += '?'
-        url += urlencode(params)
-        response = urlfetch.fetch(url)
+    def _fetch(self, url, params, conditional):
+        url = get_url(url, params)
+        headers = self.get_conditional_headers(url) if conditional else {}
+        response = urlfetch.fetch(url, headers=headers)
+        if response.status_code == 304:
+            return NOT_MODIFIED
+        if conditional:
+            self.remember(url, response.headers)
+        return response.content
+
+    def open(self, url, params, conditional=False):
+        content = self._fetch(url, params, conditional)
+        if content is NOT_MODIFIED:
+            return content
+
+        return json.loads(content.decode('utf-8'), parse_float=decimal.Decimal)
+
+    def open_stream(self, url, params, conditional=False):
+        """Make a request returning a file-like object with the response
+        body. The body is fetched at once, urlfetch doesn't stream it.
+        """
+        content = self._fetch(url, params, conditional)
+        if content is NOT_MODIFIED:
+            return content
 
-        return json.load(response.content)
+        return io.BytesIO(content)
@@ -1,8 +1,32 @@
 # -*- coding: utf-8 -*-
-from six import iteritems
+import datetime
+import decimal
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
 
-from .exchange_rates import ExchangeRate
-from .openers import DefaultOpener
+from six import iteritems, string_types
+
+from .exchange_rates import ExchangeRate, RateMatrix
+from .jsonstream import iter_json
+from .openers import DefaultOpener, NOT_MODIFIED
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    _replace = os.replace
+except AttributeError:
+    def _replace(src, dst):
+        try:
+            os.rename(src, dst)
+        except OSError:
+            # Windows doesn't rename over an existing file.
+            os.remove(dst)
+            os.rename(src, dst)
 
 
 class ServiceError(Exception):
@@ -11,6 +35,68 @@ class ServiceError(Exception):
     """
 
 
+def _get_date(date):
+    if isinstance(date, string_types):
+        return date
+    return date.isoformat()
+
+
+class DiskCache(object):
+    """Persistent cache of service responses keeping one JSON file per date.
+
+    Initialization params:
+        `directory`
+            Directory where files are kept. It's created if it doesn't
+            exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def get_path(self, date, params):
+        """Get the path of the file caching a response.
+
+        :param date: :class:`datetime.date` instance or ISO formatted date.
+        :param params: Dictionary of get params of the request.
+        """
+        name = _get_date(date)
+        if params:
+            digest = hashlib.sha1(
+                json.dumps(params, sort_keys=True).encode('utf-8'))
+            name += '-' + digest.hexdigest()[:12]
+        return os.path.join(self.directory, name + '.json')
+
+    def get(self, date, params):
+        """Get a cached response.
+
+        :return: Response as a dictionary, ``None`` if it's not cached.
+        """
+        try:
+            with open(self.get_path(date, params)) as f:
+                rates = json.load(f, parse_float=decimal.Decimal)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return rates
+
+    def set(self, date, params, rates):
+        """Cache a response."""
+        path = self.get_path(date, params)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(rates, f, separators=(',', ':'), default=str)
+            _replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
 class OpenExchangeRates(object):
     """Interface to openexchangerates.org service.
 
@@ -20,23 +106,98 @@ class OpenExchangeRates(object):
 
         `use_https`
             Defaults to `False`. Whether or not use https as the protocol.
+
+        `cache`
+            Optional :class:`~rockefeller.services.DiskCache` where historical
+            rates are kept.
+
+        `conditional`
+            Defaults to `False`. Whether or not :meth:`latest` makes
+            conditional requests. When the rates didn't change since the
+            previous request the service answers without a body and the
+            results are empty, with their ``modified`` attribute set to
+            `False`. Conditional clients get their own ``url_opener``, a new
+            instance of the class of the shared one, so the validators of the
+            responses aren't shared with other clients.
     """
     class Results(object):
-        def __init__(self, rates):
+        def __init__(self, rates, modified=True):
             self.rates = rates
+            self.modified = modified
 
         def __iter__(self):
+            if not self.modified:
+                return
             base = self.rates['base']
             rates = self.rates['rates']
             for code, rate in iteritems(rates):
                 yield ExchangeRate(base, code, rate)
 
+    class StreamResults(object):
+        """Exchange rates parsed while the response is read.
+
+        :raises: :class:`~rockefeller.services.ServiceError` while iterating
+            if the service returns an error.
+        """
+        def __init__(self, response):
+            self.response = response
+
+        def _iter_rates(self):
+            base = None
+            error = None
+            description = 'Unknow Error'
+            pending = []
+            try:
+                for path, value in iter_json(self.response):
+                    key = path[0] if path else None
+                    if key == 'rates' and len(path) > 1:
+                        if base is None:
+                            pending.append((path[1:], value))
+                        else:
+                            yield path[1:], ExchangeRate(base, path[-1], value)
+                    elif key == 'base' and len(path) == 1:
+                        base = value
+                        for rate_path, rate in pending:
+                            yield rate_path, ExchangeRate(base, rate_path[-1],
+                                                          rate)
+                        pending = []
+                    elif key == 'error' and len(path) == 1:
+                        error = value
+                    elif key == 'description' and len(path) == 1:
+                        description = value
+            finally:
+                close = getattr(self.response, 'close', None)
+                if close is not None:
+                    close()
+
+            if error or base is None:
+                raise ServiceError(description)
+
+        def __iter__(self):
+            for path, exchange_rate in self._iter_rates():
+                if len(path) == 1:
+                    yield exchange_rate
+
+        def iter_dated(self):
+            """Iterate over the rates of a time series response.
+
+            :return: Generator object. Each yielded value is a
+                ``(date, exchange_rate)`` tuple.
+            """
+            for path, exchange_rate in self._iter_rates():
+                if len(path) == 2:
+                    yield path[0], exchange_rate
+
     api_endpoint = '{protocol}://openexchangerates.org/api/{endpoint}'
     url_opener = DefaultOpener()
 
-    def __init__(self, app_id, use_https=False):
+    def __init__(self, app_id, use_https=False, cache=None, conditional=False):
         self.app_id = app_id
         self.use_https = use_https
+        self.cache = cache
+        self.conditional = conditional
+        if conditional:
+            self.url_opener = self.url_opener.__class__()
 
     def get_url(self, endpoint):
         protocol = 'https' if self.use_https else 'http'
@@ -44,16 +205,188 @@ class OpenExchangeRates(object):
             endpoint += '.json'
         return self.api_endpoint.format(protocol=protocol, endpoint=endpoint)
 
+    def _open(self, endpoint, params, conditional=False):
+        params = dict(params, app_id=self.app_id)
+        if conditional:
+            rates = self.url_opener.open(self.get_url(endpoint), params,
+                                         conditional=True)
+            if rates is NOT_MODIFIED:
+                return rates
+        else:
+            rates = self.url_opener.open(self.get_url(endpoint), params)
+        if not 'base' in rates:
+            raise ServiceError(rates.get('description', 'Unknow Error'))
+        return rates
+
     def latest(self, **params):
-        """Get latest exchange rates.
+        r"""Get latest exchange rates.
+
+        :param \*\*params: Get params passed to the service.
+
+        :return: Generator object. Each yielded value is a
+            :class:`rockefeller.exchange_rates.ExchangeRate` instance. If the
+            client is ``conditional`` and the rates didn't change, nothing is
+            yielded and its ``modified`` attribute is `False`.
+        """
+        rates = self._open('latest', params, conditional=self.conditional)
+        if rates is NOT_MODIFIED:
+            return self.Results(None, modified=False)
+        return self.Results(rates)
+
+    def historical(self, date, **params):
+        r"""Get exchange rates of a given date.
 
+        If the service has a cache the rates are only requested once per
+        date.
+
+        :param date: :class:`datetime.date` instance or ISO formatted date.
         :param \*\*params: Get params passed to the service.
 
         :return: Generator object. Each yielded value is a
             :class:`rockefeller.exchange_rates.ExchangeRate` instance.
         """
-        params.update(app_id=self.app_id)
-        rates = self.url_opener.open(self.get_url('latest'), params)
-        if not 'base' in rates:
-            raise ServiceError(rates.get('description', 'Unknow Error'))
+        rates = None
+        if self.cache is not None:
+            rates = self.cache.get(date, params)
+        if rates is None:
+            rates = self._open('historical/' + _get_date(date), params)
+            if self.cache is not None:
+                self.cache.set(date, params, rates)
         return self.Results(rates)
+
+    def stream(self, endpoint, **params):
+        r"""Get exchange rates from an endpoint of the service parsing them
+        while the response is read.
+
+        :param endpoint: Name of the endpoint, for example ``'latest'``.
+        :param \*\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.StreamResults`
+            instance.
+        """
+        params.update(app_id=self.app_id)
+        response = self.url_opener.open_stream(self.get_url(endpoint), params)
+        return self.StreamResults(response)
+
+    def time_series(self, start, end, **params):
+        r"""Get exchange rates of every date between two dates parsing them
+        while the response is read.
+
+        :param start: First date. :class:`datetime.date` instance or ISO
+            formatted date.
+        :param end: Last date, included. :class:`datetime.date` instance or
+            ISO formatted date.
+        :param \*\*params: Get params passed to the service.
+
+        :return: :class:`rockefeller.services.OpenExchangeRates.StreamResults`
+            instance. Use its ``iter_dated`` method for getting the rates
+            together with their date.
+        """
+        params.update(start=_get_date(start), end=_get_date(end))
+        return self.stream('time-series', **params)
+
+    def historical_range(self, start, end, **params):
+        r"""Get exchange rates of every date between two dates.
+
+        :param start: First date. :class:`datetime.date` instance.
+        :param end: Last date, included. :class:`datetime.date` instance.
+        :param \*\*params: Get params passed to the service.
+
+        :return: Generator object. Each yielded value is a ``(date, rates)``
+            tuple, like :meth:`historical` returns.
+        """
+        date = start
+        while date <= end:
+            yield date, self.historical(date, **params)
+            date += datetime.timedelta(days=1)
+
+
+class RateRefresher(object):
+    r"""Periodically fetch the latest exchange rates and install them as the
+    exchange rates store.
+
+    Every refresh builds a complete new store from the fetched rates and
+    installs it at once, so readers never see a half-updated table and don't
+    need any lock.
+
+    Initialization params:
+        `service`
+            :class:`~rockefeller.services.OpenExchangeRates` instance. If it's
+            ``conditional`` unchanged rates aren't installed again.
+
+        `interval`
+            Defaults to `3600`. Seconds between refreshes.
+
+        `factory`
+            Defaults to :class:`~rockefeller.exchange_rates.RateMatrix`.
+            Function building a store from the fetched rates.
+
+        `install`
+            Defaults to :func:`rockefeller.set_exchange_rates_store`. Function
+            receiving every new store.
+
+        `\*\*params`
+            Get params passed to the service.
+    """
+
+    def __init__(self, service, interval=3600, factory=RateMatrix,
+                 install=None, **params):
+        if install is None:
+            from . import set_exchange_rates_store as install
+        self.service = service
+        self.interval = interval
+        self.factory = factory
+        self.install = install
+        self.params = params
+        self.store = None
+        self.last_error = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def refresh(self):
+        """Fetch the latest rates and install a new store with them.
+
+        :return: `True` if a new store was installed, `False` if the rates
+            didn't change.
+        """
+        results = self.service.latest(**self.params)
+        if getattr(results, 'modified', True) is False:
+            return False
+        store = self.factory(results)
+        self.install(store)
+        self.store = store
+        return True
+
+    def run(self):
+        """Refresh the rates every ``interval`` seconds until stopped.
+        Errors are logged and kept in ``last_error``, they don't stop the
+        refresher.
+        """
+        while not self.stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.exception('Error refreshing exchange rates.')
+                self.last_error = e
+            else:
+                self.last_error = None
+            self.stopped.wait(self.interval)
+
+    def start(self):
+        """Start refreshing the rates in a background daemon thread."""
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run,
+                                       name='RateRefresher')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the background thread and wait for it.
+
+        :param timeout: Seconds to wait for the thread, `None` waits until it
+            finishes.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
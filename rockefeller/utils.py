@@ -1,10 +1,90 @@
 # -*- coding: utf-8 -*-
+import decimal
 import logging
+import threading
 try:
     from urllib.request import BaseHandler
 except ImportError:
     from urllib2 import BaseHandler
 
+try:
+    from contextvars import ContextVar
+except ImportError:
+    class ContextVar(object):
+        """Thread-local stand-in for :class:`contextvars.ContextVar` in
+        Python versions without it.
+        """
+        def __init__(self, name, default=None):
+            self.name = name
+            self.default = default
+            self.local = threading.local()
+
+        def get(self):
+            return getattr(self.local, 'value', self.default)
+
+        def set(self, value):
+            token = self.get()
+            self.local.value = value
+            return token
+
+        def reset(self, token):
+            self.local.value = token
+
+
+#: Decimal context of divisions, rate inversions and rate multiplications of
+#: money and exchange rates computations. It's used instead of the context of
+#: the current thread so results don't depend on it.
+decimal_context = decimal.Context(
+    prec=28, rounding=decimal.ROUND_HALF_EVEN,
+    traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow])
+
+try:
+    _MAX_PREC = decimal.MAX_PREC
+except AttributeError:
+    # The Python 2 decimal module has no limits.
+    _MAX_PREC = 999999999999999999
+
+#: Decimal context of the operations that must not round: adding and
+#: subtracting amounts and scaling them into minor units. Its precision is
+#: only bounded by the size of the operands, while its exponent limits are
+#: the default ones so huge amounts overflow instead of being expanded.
+exact_context = decimal.Context(
+    prec=_MAX_PREC, Emax=999999, Emin=-999999,
+    traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow,
+           decimal.Inexact])
+
+
+def get_decimal_context():
+    """Get the decimal context of divisions, rate inversions and rate
+    multiplications.
+
+    :return: :class:`decimal.Context` instance.
+    """
+    return decimal_context
+
+
+def set_decimal_context(prec=None, rounding=None):
+    """Configure the decimal context of divisions, rate inversions and rate
+    multiplications. It's shared by every thread. Additions and subtractions
+    of amounts are always exact.
+
+    :param prec: Number of significant digits of the results. Left unchanged
+        if not given.
+    :param rounding: Rounding mode of the results, for example
+        ``decimal.ROUND_HALF_UP``. Left unchanged if not given.
+    """
+    if prec is not None:
+        decimal_context.prec = prec
+    if rounding is not None:
+        decimal_context.rounding = rounding
+
+
+def reset_decimal_context():
+    """Restore the default decimal context configuration: `28` digits
+    rounding with ``decimal.ROUND_HALF_EVEN``.
+    """
+    set_decimal_context(prec=28, rounding=decimal.ROUND_HALF_EVEN)
+
 
 class LoggingHandler(BaseHandler):
     def __init__(self, name=None, level=None):
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 7):
+    # These tests use the async/await syntax and asyncio.run.
+    collect_ignore.append('test_async_services.py')
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import decimal
+
+import pytest
+
+import rockefeller
+
+
+def setup_module(module):
+    module.usd = rockefeller.Currency(name='United States Dollar',
+                                      code='USD', numeric='840',
+                                      symbol=u'$', exponent=2)
+    module.eur = rockefeller.Currency(name='Euro',
+                                      code='EUR', numeric='978',
+                                      symbol=u'€', exponent=2)
+    module.clp = rockefeller.Currency(name='Chilean Peso',
+                                      code='CLP', numeric='152',
+                                      symbol=u'$', exponent=0)
+
+
+class TestMoneyArray:
+    def test_from_moneys(self):
+        a = rockefeller.MoneyArray.from_moneys([rockefeller.Money(1, usd),
+                                                rockefeller.Money(2.5, usd)])
+        assert list(a.units) == [100, 250]
+        assert a.currency == usd
+        assert a.exponent == 2
+
+    def test_from_moneys_lossless(self):
+        moneys = [rockefeller.Money('100.235', usd),
+                  rockefeller.Money('-0.1', usd)]
+        a = rockefeller.MoneyArray.from_moneys(moneys)
+
+        assert a.exponent == 3
+        assert a.to_moneys() == moneys
+
+    def test_from_moneys_empty(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.MoneyArray.from_moneys([])
+
+        a = rockefeller.MoneyArray.from_moneys([], currency=usd)
+        assert len(a) == 0
+
+    def test_from_moneys_different_currencies(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.MoneyArray.from_moneys([rockefeller.Money(1, usd),
+                                                rockefeller.Money(1, eur)])
+
+    def test_getitem(self):
+        a = rockefeller.MoneyArray([100, 250, 300], usd)
+
+        assert a[1] == rockefeller.Money('2.5', usd)
+        assert a[1:] == rockefeller.MoneyArray([250, 300], usd)
+
+    def test_sum(self):
+        a = rockefeller.MoneyArray([100, 250, -50], usd)
+
+        assert a.sum() == rockefeller.Money(3, usd)
+
+    def test_add(self):
+        a = rockefeller.MoneyArray([100, 250], usd)
+        b = rockefeller.MoneyArray([1005, 1], usd, exponent=3)
+
+        assert a + b == rockefeller.MoneyArray([2005, 2501], usd, exponent=3)
+        assert a + rockefeller.Money(1, usd) == rockefeller.MoneyArray(
+            [200, 350], usd)
+
+    def test_sub(self):
+        a = rockefeller.MoneyArray([100, 250], usd)
+        b = rockefeller.MoneyArray([150, 50], usd)
+
+        assert a - b == rockefeller.MoneyArray([-50, 200], usd)
+
+    def test_unsupported_add(self):
+        a = rockefeller.MoneyArray([100], usd)
+
+        with pytest.raises(TypeError):
+            a + 100
+        with pytest.raises(rockefeller.MoneyError):
+            a + rockefeller.MoneyArray([100], eur)
+        with pytest.raises(ValueError):
+            a + rockefeller.MoneyArray([100, 200], usd)
+
+    def test_mul(self):
+        a = rockefeller.MoneyArray([100, 250], usd)
+
+        assert a * 3 == rockefeller.MoneyArray([300, 750], usd)
+        assert (a * decimal.Decimal('0.5')).to_moneys() == [
+            rockefeller.Money('0.5', usd), rockefeller.Money('1.25', usd)]
+
+    def test_mul_keeps_exponent(self):
+        a = rockefeller.MoneyArray([100, 250], usd)
+
+        result = a * decimal.Decimal('1.20')
+
+        assert result.exponent == 2
+        assert list(result.units) == [120, 300]
+        assert (a * decimal.Decimal('1.01')).exponent == 3
+
+    def test_mul_overflow(self):
+        a = rockefeller.MoneyArray([100], usd)
+
+        with pytest.raises(rockefeller.MoneyError):
+            for _ in range(20):
+                a = a * decimal.Decimal('1.1')
+
+    def test_compare(self):
+        a = rockefeller.MoneyArray([100, 250, 300], usd)
+
+        assert list(a.compare(rockefeller.Money('2.5', usd))) == [-1, 0, 1]
+        assert list(a.compare(rockefeller.MoneyArray([300, 250, 100], usd))) \
+            == [-1, 0, 1]
+
+    def test_rounded(self):
+        moneys = [rockefeller.Money(a, usd)
+                  for a in ('100.235', '100.234', '-100.235', '0.005')]
+        rounded = rockefeller.MoneyArray.from_moneys(moneys).rounded()
+
+        assert rounded.exponent == 2
+        assert [m.amount for m in rounded] == [m.rounded_amount
+                                               for m in moneys]
+
+    def test_rounded_exponent_0(self):
+        moneys = [rockefeller.Money(a, clp) for a in ('60551.5', '60551.49')]
+        rounded = rockefeller.MoneyArray.from_moneys(moneys).rounded()
+
+        assert [m.amount for m in rounded] == [m.rounded_amount
+                                               for m in moneys]
+
+
+class TestAllocateMany:
+    def test_allocate_many(self):
+        moneys = [rockefeller.Money('100', usd), rockefeller.Money('0.05', usd)]
+
+        first, second = rockefeller.allocate_many(moneys, [2, 1])
+
+        assert first.to_moneys() == [rockefeller.Money('66.67', usd),
+                                     rockefeller.Money('0.03', usd)]
+        assert second.to_moneys() == [rockefeller.Money('33.33', usd),
+                                      rockefeller.Money('0.02', usd)]
+
+    def test_allocate_many_array(self):
+        a = rockefeller.MoneyArray([1000, -7], clp)
+
+        parts = rockefeller.split_many(a, 3)
+
+        assert [list(part.units) for part in parts] == [[334, -3], [333, -2],
+                                                        [333, -2]]
+        assert sum(parts[1:], parts[0]) == a
+
+    def test_allocate_many_rescales(self):
+        a = rockefeller.MoneyArray([1000, 2500], usd, exponent=3)
+
+        parts = rockefeller.split_many(a, 2)
+
+        assert parts[0].exponent == 2
+        assert list(parts[0].units) == [50, 125]
+
+    def test_allocate_many_inexact(self):
+        a = rockefeller.MoneyArray([1001], usd, exponent=3)
+
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.split_many(a, 2)
+
+    def test_split_many_invalid(self):
+        with pytest.raises(ValueError):
+            rockefeller.split_many([rockefeller.Money(1, usd)], 0)
+        with pytest.raises(TypeError):
+            rockefeller.split_many([rockefeller.Money(1, usd)], 2.5)
+
+    def test_split_many_overflow(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.split_many([rockefeller.Money(10 ** 17, usd)], 2)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+import decimal
+import json
+
+import mock
+import pytest
+
+from rockefeller.services import DiskCache, ServiceError
+from rockefeller.async_services import (AsyncOpenExchangeRates,
+                                        KeepAliveTransport)
+
+
+class StubServer(object):
+    """Local HTTP server answering every request with ``body``."""
+
+    def __init__(self, body, chunked=False, close=False, status='200 OK'):
+        self.body = json.dumps(body).encode('utf-8')
+        self.status = status
+        self.chunked = chunked
+        self.close = close
+        self.connections = 0
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            while (await reader.readline()) not in (b'\r\n', b''):
+                pass
+            self.requests.append(request_line.decode('latin-1').split()[1])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            headers = ['HTTP/1.1 ' + self.status,
+                       'Content-Type: application/json']
+            if self.chunked:
+                headers.append('Transfer-Encoding: chunked')
+                half = len(self.body) // 2
+                body = b''.join(b'%x\r\n%s\r\n' % (len(chunk), chunk)
+                                for chunk in (self.body[:half],
+                                              self.body[half:])) + b'0\r\n\r\n'
+            else:
+                headers.append('Content-Length: {}'.format(len(self.body)))
+                body = self.body
+            if self.close:
+                headers.append('Connection: close')
+            writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1')
+                         + body)
+            await writer.drain()
+            if self.close:
+                break
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def client_for(server, **kwargs):
+    client = AsyncOpenExchangeRates(app_id='123', **kwargs)
+    client.api_endpoint = ('{protocol}://127.0.0.1:%d/api/{endpoint}' %
+                           server.port)
+    return client
+
+
+RATES = {'base': 'USD', 'rates': {'EUR': 0.78}}
+
+
+class TestAsyncOpenExchangeRates:
+    def test_latest(self):
+        async def run():
+            async with StubServer(RATES) as server:
+                async with client_for(server) as client:
+                    results = await client.latest()
+            return server, list(results)
+
+        server, rates = asyncio.run(run())
+
+        usd_eur, = rates
+        assert usd_eur.code_from == 'USD'
+        assert usd_eur.code_to == 'EUR'
+        assert usd_eur.rate == decimal.Decimal('0.78')
+        assert server.requests == ['/api/latest.json?app_id=123']
+
+    def test_connection_reused(self):
+        async def run():
+            async with StubServer(RATES) as server:
+                async with client_for(server) as client:
+                    for _ in range(3):
+                        await client.latest()
+                    opened = client.transport.connections_opened
+            return server, opened
+
+        server, opened = asyncio.run(run())
+
+        assert server.connections == 1
+        assert opened == 1
+        assert len(server.requests) == 3
+
+    def test_connection_close(self):
+        async def run():
+            async with StubServer(RATES, close=True) as server:
+                async with client_for(server) as client:
+                    await client.latest()
+                    await client.latest()
+            return server
+
+        assert asyncio.run(run()).connections == 2
+
+    def test_chunked_response(self):
+        async def run():
+            async with StubServer(RATES, chunked=True) as server:
+                async with client_for(server) as client:
+                    return list(await client.latest())
+
+        usd_eur, = asyncio.run(run())
+        assert usd_eur.rate == decimal.Decimal('0.78')
+
+    def test_fetch_many_concurrency_limit(self):
+        async def run():
+            async with StubServer(RATES) as server:
+                transport = KeepAliveTransport(max_connections=2)
+                async with client_for(server, transport=transport) as client:
+                    results = await client.fetch_many(
+                        [('latest', {'base': 'USD'})] * 5)
+            return server, results
+
+        server, results = asyncio.run(run())
+
+        assert len(results) == 5
+        assert server.max_in_flight == 2
+        assert server.connections == 2
+
+    def test_service_error(self):
+        async def run():
+            body = {'error': True, 'description': 'Invalid App ID'}
+            async with StubServer(body) as server:
+                async with client_for(server) as client:
+                    await client.latest()
+
+        with pytest.raises(ServiceError):
+            asyncio.run(run())
+
+    def test_http_error(self):
+        async def run():
+            body = {'error': True, 'status': 401,
+                    'description': 'Invalid App ID'}
+            async with StubServer(body, status='401 Unauthorized') as server:
+                async with client_for(server) as client:
+                    await client.latest()
+
+        with pytest.raises(ServiceError) as e:
+            asyncio.run(run())
+        assert 'Invalid App ID' in str(e.value)
+
+    def test_http_error_without_description(self):
+        class Transport(object):
+            async def request(self, url, headers=None):
+                return 502, {}, b'<html>Bad Gateway</html>'
+
+        client = AsyncOpenExchangeRates(app_id='123', transport=Transport())
+
+        with pytest.raises(ServiceError) as e:
+            asyncio.run(client.latest())
+        assert '502' in str(e.value)
+
+    def test_custom_transport(self):
+        class Transport(object):
+            async def request(self, url, headers=None):
+                self.url = url
+                return 200, {}, json.dumps(RATES).encode('utf-8')
+
+            async def close(self):
+                pass
+
+        transport = Transport()
+        client = AsyncOpenExchangeRates(app_id='123', use_https=True,
+                                        transport=transport)
+        results = asyncio.run(client.latest())
+
+        assert len(list(results)) == 1
+        assert transport.url.startswith('https://openexchangerates.org/')
+
+    def test_historical(self):
+        async def run():
+            async with StubServer(RATES) as server:
+                async with client_for(server) as client:
+                    results = await client.historical(datetime.date(2014, 1, 2))
+            return server, list(results)
+
+        server, rates = asyncio.run(run())
+
+        assert len(rates) == 1
+        assert server.requests == ['/api/historical/2014-01-02.json?app_id=123']
+
+    def test_historical_cache(self, tmpdir):
+        async def run():
+            async with StubServer(RATES) as server:
+                async with client_for(server, cache=cache) as client:
+                    await client.historical('2014-01-02')
+                    results = await client.historical('2014-01-02')
+            return server, list(results)
+
+        cache = DiskCache(str(tmpdir))
+        server, rates = asyncio.run(run())
+
+        assert len(rates) == 1
+        assert len(server.requests) == 1
+
+    def test_historical_range(self):
+        async def run():
+            async with StubServer(RATES) as server:
+                async with client_for(server) as client:
+                    return await client.historical_range(
+                        datetime.date(2014, 1, 1), datetime.date(2014, 1, 3))
+
+        results = asyncio.run(run())
+
+        assert [date.day for date, _ in results] == [1, 2, 3]
+        assert all(len(list(rates)) == 1 for _, rates in results)
+
+    def test_time_series(self):
+        body = {'base': 'USD',
+                'rates': {'2014-01-01': {'EUR': 0.78},
+                          '2014-01-02': {'EUR': 0.79}}}
+
+        async def run():
+            async with StubServer(body) as server:
+                async with client_for(server) as client:
+                    results = await client.time_series('2014-01-01',
+                                                       '2014-01-02')
+            return server, list(results.iter_dated())
+
+        server, rates = asyncio.run(run())
+
+        assert [(date, rate.rate) for date, rate in rates] == [
+            ('2014-01-01', decimal.Decimal('0.78')),
+            ('2014-01-02', decimal.Decimal('0.79'))]
+        assert 'start=2014-01-01' in server.requests[0]
+
+
+class TestKeepAliveTransport:
+    def test_failed_connection_closed(self):
+        writer = mock.Mock()
+
+        async def run():
+            async def connect(scheme, host, port):
+                reader = asyncio.StreamReader()
+                reader.feed_data(b'garbage\r\n')
+                reader.feed_eof()
+                writer.drain = mock.AsyncMock()
+                return reader, writer
+
+            transport = KeepAliveTransport()
+            transport._connect = connect
+            await transport.request('http://127.0.0.1/api/latest.json')
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+        assert writer.close.called
+
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import decimal
+import threading
+import time
+
+import rockefeller
+
+THREADS = 8
+ITERATIONS = 200
+
+
+def make_currency(i):
+    return rockefeller.Currency(name='Currency {}'.format(i),
+                                code='X{:02d}'.format(i), numeric=900 + i,
+                                exponent=2, symbol='')
+
+
+def run_threads(writer, reader):
+    errors = []
+    done = threading.Event()
+
+    def guard(target, *args):
+        try:
+            target(*args)
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        while not done.is_set():
+            reader()
+
+    writers = [threading.Thread(target=guard, args=(writer, i))
+               for i in range(THREADS)]
+    readers = [threading.Thread(target=guard, args=(read,))
+               for _ in range(THREADS)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+    assert errors == []
+
+
+class TestCopyOnWriteCurrency:
+    def test_stress(self):
+        store = rockefeller.CopyOnWriteCurrency()
+        currencies = [make_currency(i) for i in range(THREADS)]
+
+        def writer(i):
+            currency = currencies[i]
+            for _ in range(ITERATIONS):
+                store.support(currency)
+                store.not_support(currency)
+            store.support(currency)
+
+        def reader():
+            for currency in currencies:
+                assert store.get(currency.code) in (None, currency)
+            assert len(list(store.currencies.items())) <= THREADS
+
+        run_threads(writer, reader)
+
+        assert sorted(store.currencies) == [c.code for c in currencies]
+
+
+class TestCopyOnWriteExchangeRates:
+    def test_stress(self):
+        store = rockefeller.CopyOnWriteExchangeRates(native=True)
+        base = make_currency(THREADS)
+        other = make_currency(THREADS + 1)
+        currencies = [make_currency(i) for i in range(THREADS)]
+
+        def writer(i):
+            currency = currencies[i]
+            for n in range(1, ITERATIONS + 1):
+                rate = decimal.Decimal(n)
+                store.add_exchange_rates([(base, currency, rate),
+                                          (other, currency, rate)])
+                if n % 10 == 0:
+                    store.remove_exchange_rate(base, currency)
+                    store.remove_exchange_rate(other, currency)
+
+        def reader():
+            # Both rates of a currency are published together.
+            rates = store.rates
+            for currency in currencies:
+                rate = rates.get(store._get_key(base, currency))
+                assert rate == rates.get(store._get_key(other, currency))
+                if rate is not None:
+                    assert rates[store._get_key(currency, base)] == 1 / rate
+
+        run_threads(writer, reader)
+
+        for currency in currencies:
+            assert store.get_exchange_rate(base, currency) is None
+            assert store.get_exchange_rate(currency, base) is None
+
+
+class TestCachedExchangeRates:
+    def test_stress(self):
+        backing = rockefeller.MemoryExchangeRates(native=True)
+        base = make_currency(THREADS)
+        currencies = [make_currency(i) for i in range(THREADS)]
+        for currency in currencies:
+            backing.add_exchange_rate(base, currency, decimal.Decimal(2))
+        # A tiny cache keeps evicting the entries other threads look up.
+        store = rockefeller.CachedExchangeRates(backing, maxsize=2)
+
+        def writer(i):
+            for _ in range(ITERATIONS):
+                for currency in currencies:
+                    assert store.get_exchange_rate(base, currency) == 2
+                store.get_exchange_rates((base, currency)
+                                         for currency in currencies)
+
+        def reader():
+            store.clear()
+            time.sleep(0.0001)
+
+        run_threads(writer, reader)
+
+        assert len(store.cache) <= 2
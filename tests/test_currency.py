@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import threading
+
 import pytest
 import mock
 
@@ -49,6 +51,105 @@ class TestCurrency:
 
         rockefeller.Currency.store.get.assert_called_once_with('EUR')
 
+    def test_code_attribute_cached(self):
+        rockefeller.Currency.EUR
+        rockefeller.Currency.EUR
+
+        rockefeller.Currency.store.get.assert_called_once_with('EUR')
+
+    def test_code_attribute_miss_not_cached(self):
+        rockefeller.Currency.store = rockefeller.MemoryCurrency()
+
+        assert rockefeller.Currency.USD is None
+        rockefeller.Currency.store.support(usd)
+        assert rockefeller.Currency.USD is usd
+
+    def test_code_attribute_invalidation(self):
+        rockefeller.Currency.store = rockefeller.MemoryCurrency()
+        usd.support()
+        assert rockefeller.Currency.USD is usd
+
+        dollar = usd._replace(symbol=u'US$').support()
+        assert rockefeller.Currency.USD is dollar
+
+        dollar.not_support()
+        assert rockefeller.Currency.USD is None
+
+    def test_code_attribute_store_swap(self):
+        store = rockefeller.MemoryCurrency()
+        store.support(usd)
+        rockefeller.Currency.store = store
+        assert rockefeller.Currency.USD is usd
+
+        rockefeller.set_currency_store(rockefeller.MemoryCurrency())
+        assert rockefeller.Currency.USD is None
+
+    def test_code_attribute_store_invalidation(self):
+        for store in (rockefeller.MemoryCurrency(),
+                      rockefeller.CopyOnWriteCurrency()):
+            rockefeller.Currency.store = store
+            store.support(usd)
+            assert rockefeller.Currency.USD is usd
+
+            dollar = usd._replace(symbol=u'US$')
+            store.support(dollar)
+            assert rockefeller.Currency.USD is dollar
+
+            store.not_support(dollar)
+            assert rockefeller.Currency.USD is None
+
+    def test_clear_cache(self):
+        rockefeller.Currency.store.get.return_value = usd
+        assert rockefeller.Currency.USD is usd
+
+        rockefeller.Currency.store.get.return_value = None
+        assert rockefeller.Currency.USD is usd
+        rockefeller.Currency.clear_cache()
+        assert rockefeller.Currency.USD is None
+
+    def test_using_currencies(self):
+        store = rockefeller.MemoryCurrency()
+        store.support(usd)
+
+        with rockefeller.using_currencies(store):
+            assert rockefeller.Currency.USD is usd
+            usd.not_support()
+        assert store.get('USD') is None
+
+        rockefeller.Currency.EUR
+        rockefeller.Currency.store.get.assert_called_once_with('EUR')
+        assert not rockefeller.Currency.store.not_support.called
+
+    def test_using_currencies_thread(self):
+        store = rockefeller.MemoryCurrency()
+        store.support(usd)
+        found = []
+
+        with rockefeller.using_currencies(store):
+            thread = threading.Thread(
+                target=lambda: found.append(rockefeller.Currency.get('USD')))
+            thread.start()
+            thread.join()
+
+        assert found == [rockefeller.Currency.store.get.return_value]
+
+    def test_intern_currency(self):
+        copy = rockefeller.Currency(*usd)
+
+        interned = rockefeller.intern_currency(copy)
+        assert rockefeller.intern_currency(rockefeller.Currency(*usd)) is \
+            interned
+
+        changed = rockefeller.intern_currency(usd._replace(symbol=u'US$'))
+        assert changed is not interned
+        assert changed.symbol == u'US$'
+        assert rockefeller.intern_currency(usd._replace(symbol=u'US$')) is \
+            changed
+
+    def test_not_equality_operator(self):
+        assert not usd != rockefeller.Currency(*usd._replace(numeric=840))
+        assert usd != usd._replace(code='EUR')
+
     def test_inmutability(self):
         with pytest.raises(AttributeError):
             usd.code = 'EUR'
@@ -90,8 +191,130 @@ class TestMemoryCurrency:
 
         assert st.get('USD') is None
 
+    def test_get_by_numeric(self):
+        st = rockefeller.MemoryCurrency()
+        st.support(usd)
+
+        assert st.get_by_numeric(840) is usd
+        assert st.get_by_numeric('840') is usd
+        assert st.get_by_numeric(978) is None
+
+        st.not_support(usd)
+        assert st.get_by_numeric(840) is None
+
+    def test_non_numeric_code(self):
+        st = rockefeller.MemoryCurrency()
+        points = rockefeller.Currency(name='Points', code='PTS', numeric='',
+                                      symbol=u'P', exponent=0)
+        st.support(points)
+
+        assert st.get('PTS') is points
+        assert st.find_by_symbol(u'P') == [points]
+        assert st.get_by_numeric('') is None
+
+        st.not_support(points)
+        assert st.get('PTS') is None
+
+    def test_find_by_symbol(self):
+        st = rockefeller.MemoryCurrency()
+        clp = rockefeller.Currency(name='Chilean Peso', code='CLP',
+                                   numeric='152', symbol=u'$', exponent=0)
+        st.support(usd)
+        st.support(clp)
+
+        assert st.find_by_symbol(u'$') == [clp, usd]
+        assert st.find_by_symbol(u'€') == []
+
+        st.not_support(clp)
+        assert st.find_by_symbol(u'$') == [usd]
+
+    def test_support_replaces_indexes(self):
+        st = rockefeller.MemoryCurrency()
+        st.support(usd)
+        dollar = usd._replace(numeric='997', symbol=u'US$')
+        st.support(dollar)
+
+        assert st.get_by_numeric(840) is None
+        assert st.get_by_numeric(997) is dollar
+        assert st.find_by_symbol(u'$') == []
+        assert st.find_by_symbol(u'US$') == [dollar]
+
+    def test_iso4217_indexes(self):
+        st = rockefeller.MemoryCurrency(iso4217=True)
+
+        assert st.get_by_numeric(392).code == 'JPY'
+        assert [c.code for c in st.find_by_symbol(u'£')] == [
+            'EGP', 'FKP', 'GBP', 'GIP', 'SHP', 'SSP', 'SYP']
+
+        st.not_support(st.get('GBP'))
+        assert st.get_by_numeric(826) is None
+        assert 'GBP' not in [c.code for c in st.find_by_symbol(u'£')]
+
+    def test_copy_on_write_indexes(self):
+        st = rockefeller.CopyOnWriteCurrency()
+        st.support(usd)
+
+        assert st.get_by_numeric(840) is usd
+        assert st.find_by_symbol(u'$') == [usd]
+
+        st.not_support(usd)
+        assert st.get_by_numeric(840) is None
+        assert st.find_by_symbol(u'$') == []
+
+    def test_iso4217(self):
+        st = rockefeller.MemoryCurrency(iso4217=True)
+        assert st.currencies == {}
+
+        jpy = st.get('JPY')
+
+        assert jpy == rockefeller.Currency(name='Yen', code='JPY', numeric=392,
+                                           exponent=0, symbol=u'¥')
+        assert st.get('JPY') is jpy
+        assert list(st.currencies) == ['JPY']
+        assert st.get('XXX') is None
+
+    def test_iso4217_interned(self):
+        jpy = rockefeller.MemoryCurrency(iso4217=True).get('JPY')
+
+        assert rockefeller.MemoryCurrency(iso4217=True).get('JPY') is jpy
+
+    def test_iso4217_replace(self):
+        st = rockefeller.MemoryCurrency(iso4217=True)
+        st.support(usd)
+
+        assert st.get('USD') is usd
+
+    def test_iso4217_not_support(self):
+        st = rockefeller.MemoryCurrency(iso4217=True)
+        st.not_support(usd)
+
+        assert st.get('USD') is None
+
+        st.support(usd)
+        assert st.get('USD') is usd
+
+    def test_iso4217_copy_on_write(self):
+        st = rockefeller.CopyOnWriteCurrency(iso4217=True)
+        eur = st.get('EUR')
+
+        assert eur.exponent == 2 and eur.symbol == u'€'
+        st.not_support(eur)
+        assert st.get('EUR') is None
+
 
 class TestGAECurrency:
+    def test_get_by_numeric(self):
+        st = rockefeller.gae.currency.GAECurrency(mock.Mock())
+        st.get_by_numeric(840)
+
+        st.model.get_by_numeric.assert_called_once_with(840)
+
+    def test_find_by_symbol(self):
+        st = rockefeller.gae.currency.GAECurrency(mock.Mock())
+        st.find_by_symbol(u'$')
+
+        st.model.find_by_symbol.assert_called_once_with(u'$')
+
     def test_support(self):
         st = rockefeller.gae.currency.GAECurrency(mock.Mock())
         st.support(usd)
@@ -110,3 +333,22 @@ class TestGAECurrency:
         st.get('USD')
 
         st.model.get.assert_called_once_with('USD')
+
+    def test_get_many(self):
+        st = rockefeller.gae.currency.GAECurrency(mock.Mock())
+        st.get_many(['USD', 'EUR'])
+
+        st.model.get_many.assert_called_once_with(['USD', 'EUR'])
+
+    def test_get_async(self):
+        st = rockefeller.gae.currency.GAECurrency(mock.Mock())
+        future = st.get_async('USD')
+
+        st.model.get_async.assert_called_once_with('USD')
+        assert future is st.model.get_async.return_value
+
+    def test_support_async(self):
+        st = rockefeller.gae.currency.GAECurrency(mock.Mock())
+        st.support_async(usd)
+
+        st.model.support_async.assert_called_once_with(usd)
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import decimal
 import mock
+import pytest
 
 import rockefeller
 import rockefeller.gae.exchange_rates
+from rockefeller.services import OpenExchangeRates
 
 
 def setup_module(module):
@@ -33,6 +35,19 @@ class TestExchangeRates:
         er.store.get_exchange_rate.assert_called_once_with(usd, eur)
         assert rate == 1.0
 
+    def test_add_exchange_rate_decimal_store(self):
+        er = rockefeller.ExchangeRates(store=mock.Mock(stores_decimals=True))
+        er.add_exchange_rate(base_currency=usd, currency=eur, exchange_rate=1.5)
+        er.store.add_exchange_rate.assert_called_once_with(
+            usd, eur, decimal.Decimal('1.5'))
+
+    def test_get_exchange_rate_decimal_store(self):
+        rate = decimal.Decimal('1.5')
+        er = rockefeller.ExchangeRates(store=mock.Mock(stores_decimals=True))
+        er.store.get_exchange_rate.return_value = rate
+
+        assert er.get_exchange_rate(base_currency=usd, currency=eur) is rate
+
     def test_get_exchange_equivalent(self):
         er = rockefeller.ExchangeRates(store=mock.Mock())
         er.store.get_exchange_rate.return_value = None
@@ -42,6 +57,148 @@ class TestExchangeRates:
         assert rate is None
 
 
+class TestUsingRates:
+    def test_override(self):
+        store = rockefeller.MemoryExchangeRates()
+        store.add_exchange_rate(usd, eur, '0.5')
+
+        with rockefeller.using_rates(store):
+            assert rockefeller.get_exchange_rate(usd, eur) == \
+                decimal.Decimal('0.5')
+            assert rockefeller.Money(10, usd).exchange_to(eur) == \
+                rockefeller.Money(5, eur)
+            rockefeller.add_exchange_rate(usd, eur, '0.25')
+        assert store.get_exchange_rate(usd, eur) == '0.25'
+        assert rockefeller.get_exchange_rate(usd, eur) is None
+
+    def test_nested(self):
+        outer = rockefeller.MemoryExchangeRates()
+        inner = rockefeller.MemoryExchangeRates()
+        er = rockefeller.ExchangeRates(store=mock.Mock())
+
+        with rockefeller.using_rates(outer):
+            with rockefeller.using_rates(inner):
+                assert er._get_store() is inner
+            assert er._get_store() is outer
+        assert er._get_store() is er.store
+
+    def test_per_task(self):
+        contextvars = pytest.importorskip('contextvars')
+        stores = {}
+        for tenant, rate in (('a', '1'), ('b', '2')):
+            stores[tenant] = rockefeller.MemoryExchangeRates()
+            stores[tenant].add_exchange_rate(usd, eur, rate)
+
+        def request(tenant):
+            with rockefeller.using_rates(stores[tenant]):
+                yield
+                yield rockefeller.get_exchange_rate(usd, eur)
+
+        # Interleave both requests the way asyncio steps its tasks, each one
+        # in a copy of the context.
+        tasks = [(contextvars.copy_context(), request(tenant))
+                 for tenant in ('a', 'b')]
+        for context, task in tasks:
+            context.run(next, task)
+        rates = [context.run(next, task) for context, task in tasks]
+        for context, task in tasks:
+            context.run(next, task, None)
+
+        assert rates == [decimal.Decimal(1), decimal.Decimal(2)]
+        assert rockefeller.get_exchange_rate(usd, eur) is None
+
+
+class TestApplySnapshot:
+    def setup_method(self, method):
+        self.gbp = rockefeller.Currency(name='Pound Sterling', code='GBP',
+                                        numeric='826', symbol=u'£',
+                                        exponent=2).support()
+        self.store = rockefeller.MemoryExchangeRates()
+        self.er = rockefeller.ExchangeRates(store=self.store)
+
+    def teardown_method(self, method):
+        self.gbp.not_support()
+
+    def snapshot(self, **rates):
+        return [rockefeller.ExchangeRate('USD', code, rate)
+                for code, rate in sorted(rates.items())]
+
+    def test_first_snapshot(self):
+        changes = self.er.apply_snapshot(self.snapshot(EUR='0.78', GBP='0.66',
+                                                       XXX='1.5'))
+
+        assert [rate.code_to for rate in changes.added] == ['EUR', 'GBP']
+        assert changes.updated == changes.removed == []
+        assert changes.unchanged == 0
+        assert self.store.get_exchange_rate(usd, eur) == '0.78'
+
+    def test_only_changes_written(self):
+        self.er.apply_snapshot(self.snapshot(EUR='0.78', GBP='0.66'))
+        self.store.add_exchange_rate = mock.Mock(
+            wraps=self.store.add_exchange_rate)
+
+        changes = self.er.apply_snapshot(self.snapshot(EUR='0.780',
+                                                       GBP='0.67'))
+
+        assert changes.added == []
+        assert changes.updated == [rockefeller.ExchangeRate('USD', 'GBP',
+                                                            '0.67')]
+        assert changes.unchanged == 1
+        self.store.add_exchange_rate.assert_called_once_with(usd, self.gbp,
+                                                             '0.67')
+
+    def test_vanished_rates_removed(self):
+        self.er.apply_snapshot(self.snapshot(EUR='0.78', GBP='0.66'))
+
+        changes = self.er.apply_snapshot(self.snapshot(EUR='0.78'))
+
+        assert changes.removed == [('USD', 'GBP')]
+        assert self.store.get_exchange_rate(usd, self.gbp) is None
+        assert self.store.get_exchange_rate(usd, eur) == '0.78'
+
+    def test_previous_keys(self):
+        self.store.add_exchange_rate(usd, self.gbp, '0.66')
+
+        changes = self.er.apply_snapshot(self.snapshot(EUR='0.78'),
+                                         previous=[('USD', 'GBP'),
+                                                   ('USD', 'XXX')])
+
+        assert changes.removed == [('USD', 'GBP')]
+        assert self.store.get_exchange_rate(usd, self.gbp) is None
+
+    def test_unhashable_store(self):
+        class Store(rockefeller.MemoryExchangeRates):
+            __hash__ = None
+
+        er = rockefeller.ExchangeRates(store=Store())
+
+        changes = er.apply_snapshot(self.snapshot(EUR='0.78'))
+
+        assert len(changes.added) == 1
+
+    def test_not_modified(self):
+        results = OpenExchangeRates.Results(None, modified=False)
+        changes = self.er.apply_snapshot(results)
+
+        assert not changes
+        assert self.store.rates == {}
+
+    def test_bulk_store(self):
+        store = mock.Mock(stores_decimals=True)
+        store.get_exchange_rates.return_value = [decimal.Decimal('0.78'), None]
+        er = rockefeller.ExchangeRates(store=store)
+
+        changes = er.apply_snapshot(self.snapshot(EUR='0.78', GBP='0.66'))
+
+        assert changes.unchanged == 1
+        store.get_exchange_rates.assert_called_once_with([(usd, eur),
+                                                          (usd, self.gbp)])
+        store.add_exchange_rates.assert_called_once_with(
+            [(usd, self.gbp, decimal.Decimal('0.66'))])
+        assert not store.get_exchange_rate.called
+        assert not store.add_exchange_rate.called
+
+
 class TestExchangeRate:
     def test_rate_as_decimal(self):
         er = rockefeller.ExchangeRate(usd, eur, .78)
@@ -83,6 +240,70 @@ class TestMemoryExchangeRates:
             rockefeller.Currency.USD, rockefeller.Currency.EUR) is None
 
 
+class TestNativeMemoryExchangeRates:
+    def test_add_exchange_rate(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        rate = decimal.Decimal('0.5')
+        st.add_exchange_rate(usd, eur, rate)
+
+        assert st.stores_decimals
+        assert st.get_exchange_rate(usd, eur) is rate
+
+    def test_add_exchange_rate_string(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        st.add_exchange_rate(usd, eur, '0.5')
+
+        assert st.get_exchange_rate(usd, eur) == decimal.Decimal('0.5')
+        assert isinstance(st.get_exchange_rate(usd, eur), decimal.Decimal)
+        assert st.get_exchange_rate(eur, usd) == decimal.Decimal(2)
+
+    def test_inverse_precomputed(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        st.add_exchange_rate(usd, eur, decimal.Decimal('0.5'))
+
+        assert st.get_exchange_rate(eur, usd) == decimal.Decimal(2)
+
+    def test_direct_rate_wins_over_inverse(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        st.add_exchange_rate(usd, eur, decimal.Decimal('0.5'))
+        st.add_exchange_rate(eur, usd, decimal.Decimal('1.9'))
+        st.add_exchange_rate(usd, eur, decimal.Decimal('0.4'))
+
+        assert st.get_exchange_rate(eur, usd) == decimal.Decimal('1.9')
+        assert st.get_exchange_rate(usd, eur) == decimal.Decimal('0.4')
+
+    def test_zero_rate_drops_inverse(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        st.add_exchange_rate(usd, eur, 2)
+        st.add_exchange_rate(usd, eur, 0)
+
+        assert st.get_exchange_rate(usd, eur) == 0
+        assert st.get_exchange_rate(eur, usd) is None
+
+    def test_zero_rate_keeps_direct_rate(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        st.add_exchange_rate(eur, usd, decimal.Decimal('1.9'))
+        st.add_exchange_rate(usd, eur, 0)
+
+        assert st.get_exchange_rate(eur, usd) == decimal.Decimal('1.9')
+
+    def test_remove_exchange_rate(self):
+        st = rockefeller.MemoryExchangeRates(native=True)
+        st.add_exchange_rate(usd, eur, decimal.Decimal('0.5'))
+        st.remove_exchange_rate(usd, eur)
+
+        assert st.get_exchange_rate(usd, eur) is None
+        assert st.get_exchange_rate(eur, usd) is None
+
+    def test_exchange_rates(self):
+        er = rockefeller.ExchangeRates(
+            store=rockefeller.MemoryExchangeRates(native=True))
+        er.add_exchange_rate(usd, eur, .5)
+
+        assert er.get_exchange_rate(usd, eur) == decimal.Decimal('0.5')
+        assert er.get_exchange_rate(eur, usd) == decimal.Decimal(2)
+
+
 class TestGAEExchangeRates:
     def test_add_exchange_rate(self):
         st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
@@ -115,3 +336,316 @@ class TestGAEExchangeRates:
         st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
 
         assert decimal.Decimal(1) == st.get_exchange_rate(eur, eur)
+
+    def test_add_exchange_rates(self):
+        st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
+        st.add_exchange_rates([(usd, eur, '0.78')])
+
+        st.model.add_exchange_rates.assert_called_once_with(
+            [(usd, eur, '0.78')])
+
+    def test_add_exchange_rate_async(self):
+        st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
+        future = st.add_exchange_rate_async(usd, eur, '0.78')
+
+        st.model.add_exchange_rate_async.assert_called_once_with(
+            usd, eur, '0.78')
+        assert future is st.model.add_exchange_rate_async.return_value
+
+    def test_remove_exchange_rate_async(self):
+        st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
+        future = st.remove_exchange_rate_async(usd, eur)
+
+        st.model.remove_exchange_rates_async.assert_called_once_with(
+            [(usd, eur), (eur, usd)])
+        assert future is st.model.remove_exchange_rates_async.return_value
+
+    def test_get_exchange_rate_async(self):
+        st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
+        future = st.get_exchange_rate_async(usd, eur)
+
+        st.model.get_exchange_rate_async.assert_called_once_with(usd, eur)
+        assert future is st.model.get_exchange_rate_async.return_value
+
+    def test_get_exchange_rates(self):
+        st = rockefeller.gae.exchange_rates.GAEExchangeRates(mock.Mock())
+        rates = st.get_exchange_rates([(usd, eur), (eur, eur)])
+
+        st.model.get_exchange_rates.assert_called_once_with(
+            [(usd, eur), (eur, eur)])
+        assert rates is st.model.get_exchange_rates.return_value
+
+
+class TestGraphExchangeRates:
+    def setup_method(self, method):
+        self.gbp = rockefeller.Currency(name='Pound Sterling', code='GBP',
+                                        numeric='826', symbol=u'£',
+                                        exponent=2)
+        self.jpy = rockefeller.Currency(name='Yen', code='JPY', numeric='392',
+                                        symbol=u'¥', exponent=0)
+        self.st = rockefeller.GraphExchangeRates(
+            rockefeller.MemoryExchangeRates())
+        self.st.add_exchange_rate(usd, eur, '0.5')
+        self.st.add_exchange_rate(eur, self.gbp, '0.8')
+        self.st.add_exchange_rate(self.jpy, self.gbp, '0.01')
+
+    def test_direct_exchange_rate(self):
+        assert self.st.get_exchange_rate(usd, eur) == '0.5'
+
+    def test_path_exchange_rate(self):
+        assert self.st.get_exchange_rate(usd, self.gbp) == \
+            decimal.Decimal('0.4')
+        assert self.st.get_exchange_rate(usd, self.jpy) == \
+            decimal.Decimal('40')
+        assert self.st.get_exchange_rate(self.jpy, usd) == \
+            decimal.Decimal('0.025')
+
+    def test_find_path(self):
+        assert self.st.find_path(usd, self.jpy) == [usd, eur, self.gbp,
+                                                    self.jpy]
+
+    def test_fewest_hops(self):
+        self.st.add_exchange_rate(usd, self.gbp, '0.3')
+
+        assert self.st.find_path(usd, self.jpy) == [usd, self.gbp, self.jpy]
+        assert self.st.get_exchange_rate(usd, self.jpy) == \
+            decimal.Decimal('30')
+
+    def test_weighted_path(self):
+        def weight(base_currency, currency):
+            return 10 if self.gbp in (base_currency, currency) else 1
+
+        st = rockefeller.GraphExchangeRates(rockefeller.MemoryExchangeRates(),
+                                            weight=weight)
+        st.add_exchange_rate(usd, self.gbp, 1)
+        st.add_exchange_rate(self.gbp, self.jpy, 1)
+        st.add_exchange_rate(usd, eur, 1)
+        st.add_exchange_rate(eur, self.jpy, 1)
+
+        assert st.find_path(usd, self.jpy) == [usd, eur, self.jpy]
+
+    def test_not_connected(self):
+        st = rockefeller.GraphExchangeRates(rockefeller.MemoryExchangeRates())
+        st.add_exchange_rate(usd, eur, 1)
+        st.add_exchange_rate(self.gbp, self.jpy, 1)
+
+        assert st.get_exchange_rate(usd, self.jpy) is None
+        assert st.get_exchange_rate(usd, usd) is None
+
+    def test_path_memoized(self):
+        self.st.get_exchange_rate(usd, self.jpy)
+        self.st.find_path = mock.Mock()
+
+        assert self.st.get_exchange_rate(usd, self.jpy) == \
+            decimal.Decimal('40')
+        assert not self.st.find_path.called
+
+    def test_update_invalidates_path(self):
+        self.st.get_exchange_rate(usd, self.gbp)
+        self.st.add_exchange_rate(eur, self.gbp, '0.9')
+
+        assert self.st.get_exchange_rate(usd, self.gbp) == \
+            decimal.Decimal('0.45')
+
+    def test_update_keeps_other_paths(self):
+        self.st.get_exchange_rate(usd, self.gbp)
+        self.st.add_exchange_rate(self.jpy, self.gbp, '0.02')
+
+        assert (usd, self.gbp) in self.st.paths
+
+    def test_remove_invalidates_path(self):
+        self.st.get_exchange_rate(usd, self.jpy)
+        self.st.remove_exchange_rate(eur, self.gbp)
+
+        assert self.st.get_exchange_rate(usd, self.jpy) is None
+
+    def test_money_exchange(self):
+        store = rockefeller.exchange_rates.store
+        rockefeller.set_exchange_rates_store(self.st)
+        try:
+            money = rockefeller.Money(100, usd).exchange_to(self.jpy)
+        finally:
+            rockefeller.set_exchange_rates_store(store)
+
+        assert money == rockefeller.Money(4000, self.jpy)
+
+
+class TestRateMatrix:
+    def setup_method(self, method):
+        self.clp = rockefeller.Currency(name='Chilean Peso', code='CLP',
+                                        numeric='152', symbol=u'$',
+                                        exponent=0)
+        self.st = rockefeller.RateMatrix(OpenExchangeRates.Results(
+            {'base': 'USD', 'rates': {'USD': 1, 'EUR': '0.5', 'CLP': '400'}}))
+
+    def test_base_rates(self):
+        assert self.st.get_exchange_rate(usd, eur) == decimal.Decimal('0.5')
+        assert self.st.get_exchange_rate(usd, self.clp) == \
+            decimal.Decimal('400')
+
+    def test_cross_rates(self):
+        assert self.st.get_exchange_rate(eur, usd) == decimal.Decimal('2')
+        assert self.st.get_exchange_rate(eur, self.clp) == \
+            decimal.Decimal('800')
+        assert self.st.get_exchange_rate(self.clp, eur) == \
+            decimal.Decimal('0.00125')
+
+    def test_same_currency(self):
+        assert self.st.get_exchange_rate(eur, eur) == decimal.Decimal(1)
+
+    def test_unknown_currency(self):
+        gbp = rockefeller.Currency(name='Pound Sterling', code='GBP',
+                                   numeric='826', symbol=u'£', exponent=2)
+
+        assert self.st.get_exchange_rate(usd, gbp) is None
+        assert self.st.get_exchange_rate(gbp, usd) is None
+
+    def test_different_bases(self):
+        with pytest.raises(ValueError):
+            rockefeller.RateMatrix([rockefeller.ExchangeRate('USD', 'EUR', 1),
+                                    rockefeller.ExchangeRate('EUR', 'CLP', 1)])
+
+    def test_read_only(self):
+        with pytest.raises(TypeError):
+            self.st.add_exchange_rate(usd, eur, 1)
+        with pytest.raises(TypeError):
+            self.st.remove_exchange_rate(usd, eur)
+
+    def test_zero_and_repeated_rates(self):
+        st = rockefeller.RateMatrix([
+            rockefeller.ExchangeRate('USD', 'EUR', '0.4'),
+            rockefeller.ExchangeRate('USD', 'CLP', 0),
+            rockefeller.ExchangeRate('USD', 'EUR', '0.5')])
+
+        assert st.codes == ['USD', 'EUR']
+        assert st.get_exchange_rate(eur, usd) == decimal.Decimal('2')
+        assert st.get_exchange_rate(usd, self.clp) is None
+
+    def test_money_exchange(self):
+        store = rockefeller.exchange_rates.store
+        rockefeller.set_exchange_rates_store(self.st)
+        try:
+            money = rockefeller.Money(10, eur).exchange_to(self.clp)
+        finally:
+            rockefeller.set_exchange_rates_store(store)
+
+        assert money == rockefeller.Money(8000, self.clp)
+
+
+class TestCachedExchangeRates:
+    def setup_method(self, method):
+        self.now = 0
+        self.backing = rockefeller.MemoryExchangeRates()
+        self.backing.add_exchange_rate(usd, eur, '0.78')
+        self.backing.get_exchange_rate = mock.Mock(
+            wraps=self.backing.get_exchange_rate)
+        self.st = rockefeller.CachedExchangeRates(
+            self.backing, maxsize=2, ttl=10, negative_ttl=5,
+            clock=lambda: self.now)
+
+    def test_get_exchange_rate_cached(self):
+        assert self.st.get_exchange_rate(usd, eur) == '0.78'
+        assert self.st.get_exchange_rate(usd, eur) == '0.78'
+
+        assert self.backing.get_exchange_rate.call_count == 1
+        assert self.st.hits == 1
+        assert self.st.misses == 1
+
+    def test_missing_rate_cached(self):
+        assert self.st.get_exchange_rate(eur, usd) is None
+        assert self.st.get_exchange_rate(eur, usd) is None
+
+        assert self.backing.get_exchange_rate.call_count == 1
+
+    def test_ttl(self):
+        self.st.get_exchange_rate(usd, eur)
+        self.st.get_exchange_rate(eur, usd)
+        self.now = 6
+        self.st.get_exchange_rate(usd, eur)
+        self.st.get_exchange_rate(eur, usd)
+
+        assert self.backing.get_exchange_rate.call_count == 3
+
+        self.now = 11
+        self.st.get_exchange_rate(usd, eur)
+
+        assert self.backing.get_exchange_rate.call_count == 4
+
+    def test_lru_eviction(self):
+        self.st.get_exchange_rate(usd, eur)
+        self.st.get_exchange_rate(eur, usd)
+        self.st.get_exchange_rate(usd, eur)
+        self.st.get_exchange_rate(usd, usd)
+
+        assert len(self.st.cache) == 2
+        self.st.get_exchange_rate(usd, eur)
+        assert self.backing.get_exchange_rate.call_count == 3
+        self.st.get_exchange_rate(eur, usd)
+        assert self.backing.get_exchange_rate.call_count == 4
+
+    def test_add_exchange_rate_invalidates(self):
+        self.st.get_exchange_rate(usd, eur)
+        self.st.get_exchange_rate(eur, usd)
+        self.st.add_exchange_rate(eur, usd, '1.28')
+
+        assert self.st.get_exchange_rate(eur, usd) == '1.28'
+        assert self.st.get_exchange_rate(usd, eur) == '0.78'
+        assert self.backing.get_exchange_rate.call_count == 4
+
+    def test_write_during_read(self):
+        get_exchange_rate = self.backing.get_exchange_rate
+
+        def read_then_write(base_currency, currency):
+            rate = get_exchange_rate(base_currency, currency)
+            self.st.add_exchange_rate(usd, eur, '0.80')
+            return rate
+        self.backing.get_exchange_rate = read_then_write
+
+        assert self.st.get_exchange_rate(usd, eur) == '0.78'
+        self.backing.get_exchange_rate = get_exchange_rate
+        assert self.st.get_exchange_rate(usd, eur) == '0.80'
+
+    def test_write_during_bulk_read(self):
+        get_exchange_rate = self.backing.get_exchange_rate
+
+        def read_then_clear(base_currency, currency):
+            rate = get_exchange_rate(base_currency, currency)
+            self.st.clear()
+            return rate
+        self.backing.get_exchange_rate = read_then_clear
+
+        assert self.st.get_exchange_rates([(usd, eur)]) == ['0.78']
+        assert len(self.st.cache) == 0
+
+    def test_remove_exchange_rate_invalidates(self):
+        self.st.get_exchange_rate(usd, eur)
+        self.st.remove_exchange_rate(eur, usd)
+
+        assert self.st.get_exchange_rate(usd, eur) is None
+
+    def test_get_exchange_rates(self):
+        self.st.get_exchange_rate(usd, eur)
+        rates = self.st.get_exchange_rates([(usd, eur), (eur, usd)])
+
+        assert rates == ['0.78', None]
+        assert self.st.hits == 1
+        assert self.backing.get_exchange_rate.call_count == 2
+
+    def test_get_exchange_rates_bulk_store(self):
+        backing = mock.Mock(spec=['get_exchange_rate', 'get_exchange_rates'])
+        backing.get_exchange_rates.return_value = ['0.78', None]
+        st = rockefeller.CachedExchangeRates(backing)
+
+        assert st.get_exchange_rates([(usd, eur), (eur, usd)]) == ['0.78', None]
+        assert st.get_exchange_rate(usd, eur) == '0.78'
+        assert st.get_exchange_rate(eur, usd) is None
+        backing.get_exchange_rates.assert_called_once_with([(usd, eur),
+                                                            (eur, usd)])
+        assert not backing.get_exchange_rate.called
+
+    def test_stores_decimals(self):
+        st = rockefeller.CachedExchangeRates(
+            rockefeller.MemoryExchangeRates(native=True))
+
+        assert st.stores_decimals
+        assert not self.st.stores_decimals
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+import sys
+import types
+
+import mock
+
+import rockefeller
+
+
+class FakeDatastore(object):
+    def __init__(self):
+        self.entities = {}
+        self.rpcs = 0
+
+
+class Future(object):
+    def __init__(self, result):
+        self.result = result
+
+    def get_result(self):
+        return self.result
+
+
+class Return(Exception):
+    pass
+
+
+def tasklet(func):
+    def wrapper(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        result = None
+        try:
+            while True:
+                yielded = generator.send(result)
+                if isinstance(yielded, list):
+                    result = [future.get_result() for future in yielded]
+                else:
+                    result = yielded.get_result()
+        except Return as e:
+            return Future(e.args[0] if e.args else None)
+        except StopIteration:
+            return Future(None)
+    return wrapper
+
+
+class Key(object):
+    def __init__(self, kind, id):
+        self.kind = kind
+        self.id = id
+
+    def __eq__(self, other):
+        return (self.kind.__name__, self.id) == (other.kind.__name__, other.id)
+
+    def __hash__(self):
+        return hash((self.kind.__name__, self.id))
+
+    def get(self):
+        datastore.rpcs += 1
+        return datastore.entities.get(self)
+
+    def get_async(self):
+        return Future(self.get())
+
+    def delete(self):
+        datastore.rpcs += 1
+        datastore.entities.pop(self, None)
+
+    def delete_async(self):
+        return Future(self.delete())
+
+
+class Property(object):
+    def __init__(self, required=False):
+        self.required = required
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return lambda entity: getattr(entity, self.name) == value
+
+
+class Query(object):
+    def __init__(self, kind, filters):
+        self.kind = kind
+        self.filters = filters
+
+    def fetch(self):
+        datastore.rpcs += 1
+        return [entity for key, entity in datastore.entities.items()
+                if key.kind is self.kind and
+                all(f(entity) for f in self.filters)]
+
+    def get(self):
+        entities = self.fetch()
+        return entities[0] if entities else None
+
+
+class Model(object):
+    def __init__(self, key=None, **values):
+        self.key = key
+        self.values = values
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def put(self):
+        datastore.rpcs += 1
+        datastore.entities[self.key] = self
+        return self.key
+
+    def put_async(self):
+        return Future(self.put())
+
+    def to_dict(self):
+        return dict(self.values)
+
+    @classmethod
+    def query(cls, *filters):
+        return Query(cls, filters)
+
+
+def get_multi(keys):
+    datastore.rpcs += 1
+    return [datastore.entities.get(key) for key in keys]
+
+
+def get_multi_async(keys):
+    return [Future(entity) for entity in get_multi(keys)]
+
+
+def put_multi(entities):
+    datastore.rpcs += 1
+    for entity in entities:
+        datastore.entities[entity.key] = entity
+    return [entity.key for entity in entities]
+
+
+def put_multi_async(entities):
+    return [Future(key) for key in put_multi(entities)]
+
+
+def delete_multi(keys):
+    datastore.rpcs += 1
+    for key in keys:
+        datastore.entities.pop(key, None)
+
+
+def delete_multi_async(keys):
+    delete_multi(keys)
+    return [Future(None) for _ in keys]
+
+
+datastore = FakeDatastore()
+
+
+def setup_module(module):
+    ndb = types.ModuleType('ndb')
+    ndb.Key = Key
+    ndb.Model = Model
+    ndb.StringProperty = ndb.IntegerProperty = Property
+    ndb.get_multi = get_multi
+    ndb.get_multi_async = get_multi_async
+    ndb.put_multi = put_multi
+    ndb.put_multi_async = put_multi_async
+    ndb.delete_multi = delete_multi
+    ndb.delete_multi_async = delete_multi_async
+    ndb.tasklet = tasklet
+    ndb.Return = Return
+    ext = types.ModuleType('ext')
+    ext.ndb = ndb
+    modules = {'google': types.ModuleType('google'),
+               'google.appengine': types.ModuleType('appengine'),
+               'google.appengine.ext': ext,
+               'google.appengine.ext.ndb': ndb}
+    with mock.patch.dict(sys.modules, modules):
+        from rockefeller.gae import models
+    module.models = models
+
+    module.usd = rockefeller.Currency(name='United States Dollar',
+                                      code='USD', numeric=840,
+                                      symbol=u'$', exponent=2)
+    module.eur = rockefeller.Currency(name='Euro', code='EUR', numeric=978,
+                                      symbol=u'€', exponent=2)
+    module.clp = rockefeller.Currency(name='Chilean Peso', code='CLP',
+                                      numeric=152, symbol=u'$', exponent=0)
+
+
+class TestCurrencyModel:
+    def setup_method(self, method):
+        datastore.__init__()
+        models.Currency.support(usd)
+        models.Currency.support(eur)
+
+    def test_get(self):
+        assert models.Currency.get('USD') == usd
+        assert models.Currency.get('CLP') is None
+
+    def test_not_support(self):
+        models.Currency.not_support(usd)
+
+        assert models.Currency.get('USD') is None
+
+    def test_get_async(self):
+        future = models.Currency.get_async('USD')
+
+        assert future.get_result() == usd
+        assert models.Currency.get_async('CLP').get_result() is None
+
+    def test_support_async(self):
+        models.Currency.support_async(clp).get_result()
+
+        assert models.Currency.get('CLP') == clp
+
+    def test_not_support_async(self):
+        models.Currency.not_support_async(usd).get_result()
+
+        assert models.Currency.get('USD') is None
+
+    def test_get_interned(self):
+        assert models.Currency.get('USD') is models.Currency.get('USD')
+        assert models.Currency.get_many(['USD'])[0] is \
+            models.Currency.get('USD')
+
+    def test_get_by_numeric(self):
+        assert models.Currency.get_by_numeric(978) == eur
+        assert models.Currency.get_by_numeric('840') == usd
+        assert models.Currency.get_by_numeric(152) is None
+        assert models.Currency.get_by_numeric('XTS') is None
+        assert models.Currency.get_by_numeric(None) is None
+
+    def test_find_by_symbol(self):
+        models.Currency.support(clp)
+
+        assert models.Currency.find_by_symbol(u'$') == [clp, usd]
+        assert models.Currency.find_by_symbol(u'£') == []
+
+    def test_find_by_symbol_not_support(self):
+        models.Currency.not_support(usd)
+
+        assert models.Currency.find_by_symbol(u'$') == []
+
+    def test_get_many(self):
+        datastore.rpcs = 0
+        currencies = models.Currency.get_many(['USD', 'CLP', 'EUR'])
+
+        assert currencies == [usd, None, eur]
+        assert datastore.rpcs == 1
+
+
+class TestExchangeRateModel:
+    def setup_method(self, method):
+        datastore.__init__()
+        models.ExchangeRate.add_exchange_rate(usd, eur, '0.78')
+        models.ExchangeRate.add_exchange_rate(usd, clp, '472.30')
+
+    def test_get_exchange_rate(self):
+        assert models.ExchangeRate.get_exchange_rate(usd, eur) == '0.78'
+        assert models.ExchangeRate.get_exchange_rate(eur, usd) is None
+
+    def test_remove_exchange_rate(self):
+        models.ExchangeRate.remove_exchange_rate(usd, eur)
+
+        assert models.ExchangeRate.get_exchange_rate(usd, eur) is None
+
+    def test_get_exchange_rate_same_currency(self):
+        datastore.rpcs = 0
+
+        assert models.ExchangeRate.get_exchange_rate(usd, usd) == 1
+        assert datastore.rpcs == 0
+
+    def test_get_exchange_rates(self):
+        datastore.rpcs = 0
+        rates = models.ExchangeRate.get_exchange_rates(
+            [(usd, eur), (eur, clp), (usd, usd), (usd, clp)])
+
+        assert rates == ['0.78', None, 1, '472.30']
+        assert datastore.rpcs == 1
+
+    def test_remove_exchange_rates_async(self):
+        datastore.rpcs = 0
+        future = models.ExchangeRate.remove_exchange_rates_async(
+            [(usd, eur), (usd, clp)])
+
+        assert future.get_result() is None
+        assert datastore.rpcs == 1
+        assert models.ExchangeRate.get_exchange_rate(usd, clp) is None
+
+    def test_add_exchange_rate_async(self):
+        models.ExchangeRate.add_exchange_rate_async(eur, clp, '600').get_result()
+
+        assert models.ExchangeRate.get_exchange_rate(eur, clp) == '600'
+
+    def test_add_exchange_rates(self):
+        datastore.rpcs = 0
+        models.ExchangeRate.add_exchange_rates([(eur, usd, '1.28'),
+                                                (eur, clp, '600')])
+
+        assert datastore.rpcs == 1
+        assert models.ExchangeRate.get_exchange_rate(eur, usd) == '1.28'
+        assert models.ExchangeRate.get_exchange_rate(eur, clp) == '600'
+
+    def test_add_exchange_rates_async(self):
+        future = models.ExchangeRate.add_exchange_rates_async(
+            [(eur, usd, '1.28')])
+        assert len(future.get_result()) == 1
+
+        assert models.ExchangeRate.get_exchange_rate(eur, usd) == '1.28'
+
+    def test_remove_exchange_rate_async(self):
+        models.ExchangeRate.remove_exchange_rate_async(usd, eur).get_result()
+
+        assert models.ExchangeRate.get_exchange_rate(usd, eur) is None
+
+    def test_get_exchange_rate_async(self):
+        future = models.ExchangeRate.get_exchange_rate_async(usd, eur)
+
+        assert future.get_result() == '0.78'
+        assert models.ExchangeRate.get_exchange_rate_async(
+            eur, usd).get_result() is None
+
+    def test_get_exchange_rate_async_same_currency(self):
+        datastore.rpcs = 0
+        future = models.ExchangeRate.get_exchange_rate_async(usd, usd)
+
+        assert future.get_result() == 1
+        assert datastore.rpcs == 0
+
+    def test_get_exchange_rates_async(self):
+        future = models.ExchangeRate.get_exchange_rates_async(
+            [(usd, eur), (eur, eur), (eur, clp)])
+
+        assert future.get_result() == ['0.78', 1, None]
+
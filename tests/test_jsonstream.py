@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import decimal
+import io
+import json
+
+import pytest
+
+from rockefeller.jsonstream import iter_json
+
+
+def parse(document, chunk_size=3):
+    return list(iter_json(io.BytesIO(document.encode('utf-8')),
+                          chunk_size=chunk_size))
+
+
+class TestIterJson:
+    def test_object(self):
+        events = parse('{"base": "USD", "rates": {"EUR": 0.78, "CLP": 472}}')
+
+        assert events == [(('base',), 'USD'),
+                          (('rates', 'EUR'), decimal.Decimal('0.78')),
+                          (('rates', 'CLP'), 472)]
+
+    def test_array(self):
+        events = parse('{"a": [1, {"b": null}, [true, false]], "c": []}')
+
+        assert events == [(('a', 0), 1), (('a', 1, 'b'), None),
+                          (('a', 2, 0), True), (('a', 2, 1), False)]
+
+    def test_tokens_split_across_chunks(self):
+        document = json.dumps({'rates': {'EUR': 0.781234567,
+                                         u'€ \\"': -1.5e-3}})
+        for chunk_size in range(1, 10):
+            events = parse(document, chunk_size=chunk_size)
+
+            assert dict(events) == {
+                ('rates', 'EUR'): decimal.Decimal('0.781234567'),
+                ('rates', u'€ \\"'): decimal.Decimal('-0.0015')}
+
+    def test_top_level_number(self):
+        assert parse('12345') == [((), 12345)]
+
+    def test_text_file(self):
+        events = list(iter_json(io.StringIO(u'{"a": 1.5}')))
+
+        assert events == [(('a',), decimal.Decimal('1.5'))]
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse('{"a": nope}')
@@ -56,6 +56,12 @@ class TestMoney:
         clp = rockefeller.Money(amount=100.100, currency=rockefeller.Currency.CLP)
         assert '100' == str(clp.rounded_amount)
 
+    def test_quantizer_cached(self):
+        quantizer = rockefeller.money.get_quantizer(2)
+
+        assert decimal.Decimal('1.00') == quantizer
+        assert quantizer is rockefeller.money.get_quantizer(2)
+
     def test_representation(self):
         usd = rockefeller.Money(amount=100, currency=rockefeller.Currency.USD)
         eur = rockefeller.Money(amount=78, currency=rockefeller.Currency.EUR)
@@ -157,6 +163,8 @@ class TestMoney:
 
         with pytest.raises(TypeError):
             usd1 * 100
+        with pytest.raises(TypeError):
+            100 * usd1
 
     def test_division(self):
         usd1 = rockefeller.Money(amount=10, currency=rockefeller.Currency.USD)
@@ -184,3 +192,408 @@ class TestMoney:
 
         with pytest.raises(TypeError):
             usd1 / 100
+
+
+class TestDecimalContext:
+    def teardown_method(self, method):
+        rockefeller.reset_decimal_context()
+
+    def test_thread_context_ignored(self):
+        usd = rockefeller.Currency.USD
+        with decimal.localcontext() as context:
+            context.prec = 2
+            result = rockefeller.Money(1, usd) / rockefeller.Money(3, usd)
+            total = rockefeller.Money('123.45', usd) + \
+                rockefeller.Money('0.01', usd)
+
+        assert result.amount == decimal.Decimal(1) / decimal.Decimal(3)
+        assert total.amount == decimal.Decimal('123.46')
+
+    def test_units_thread_context_ignored(self):
+        usd = rockefeller.Currency.USD
+        with decimal.localcontext() as context:
+            context.prec = 3
+            parts = rockefeller.split(rockefeller.Money('1234.56', usd), 2)
+            fixed = rockefeller.FixedMoney('1234.56', usd)
+            rounded = rockefeller.Money('1234.565', usd).rounded_amount
+
+        assert parts == [rockefeller.Money('617.28', usd)] * 2
+        assert fixed.units == 123456
+        assert fixed.amount == decimal.Decimal('1234.56')
+        assert rounded == decimal.Decimal('1234.57')
+
+    def test_addition_exact(self):
+        usd = rockefeller.Currency.USD
+        rockefeller.set_decimal_context(prec=6)
+        moneys = [rockefeller.Money('12345.67', usd),
+                  rockefeller.Money('0.01', usd)]
+
+        assert moneys[0] + moneys[1] == rockefeller.Money('12345.68', usd)
+        assert moneys[0] - moneys[1] == rockefeller.Money('12345.66', usd)
+        assert rockefeller.sum_money(moneys) == \
+            rockefeller.Money('12345.68', usd)
+        assert rockefeller.total_in(moneys, usd) == \
+            rockefeller.Money('12345.68', usd)
+
+    def test_infinite_units(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.FixedMoney('Infinity', rockefeller.Currency.USD)
+
+    def test_out_of_range(self):
+        usd = rockefeller.Currency.USD
+        huge = rockefeller.Money('1e999999999', usd)
+        tiny = rockefeller.Money('1e-999999999', usd)
+
+        with pytest.raises(rockefeller.MoneyError):
+            huge + rockefeller.Money('0.01', usd)
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.Money('0.01', usd) - tiny
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.sum_money([rockefeller.Money(1, usd), tiny])
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.Money('1e300000000', usd).rounded_amount
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.FixedMoney('1e300000000', usd)
+
+    def test_precision(self):
+        usd = rockefeller.Currency.USD
+        rockefeller.set_decimal_context(prec=6)
+
+        result = rockefeller.Money(1, usd) / rockefeller.Money(3, usd)
+
+        assert result.amount == decimal.Decimal('0.333333')
+
+    def test_rate_inversion(self):
+        rockefeller.set_decimal_context(prec=4, rounding=decimal.ROUND_UP)
+
+        rate = rockefeller.get_exchange_rate(rockefeller.Currency.EUR,
+                                             rockefeller.Currency.USD)
+
+        assert rate == decimal.Decimal('1.283')
+
+    def test_division_by_zero(self):
+        usd = rockefeller.Currency.USD
+
+        with pytest.raises(ZeroDivisionError):
+            rockefeller.Money(1, usd) / rockefeller.Money(0, usd)
+
+
+class TestExchangeMany:
+    def test_exchange_many(self):
+        moneys = [rockefeller.Money(100, rockefeller.Currency.USD),
+                  rockefeller.Money(1, rockefeller.Currency.EUR),
+                  rockefeller.Money('0.5', rockefeller.Currency.USD)]
+
+        result = rockefeller.exchange_many(moneys, rockefeller.Currency.EUR)
+
+        assert result == [
+            rockefeller.Money(78, rockefeller.Currency.EUR),
+            rockefeller.Money(1, rockefeller.Currency.EUR),
+            rockefeller.Money('0.39', rockefeller.Currency.EUR)]
+        assert result == [money.exchange_to(rockefeller.Currency.EUR)
+                          for money in moneys]
+
+    def test_exchange_many_rate_looked_up_once(self):
+        moneys = [rockefeller.Money(i, rockefeller.Currency.USD)
+                  for i in range(10)]
+        store = rockefeller.exchange_rates.store
+        calls = []
+
+        class CountingStore(object):
+            def get_exchange_rate(self, base_currency, currency):
+                calls.append((base_currency, currency))
+                return store.get_exchange_rate(base_currency, currency)
+
+        rockefeller.set_exchange_rates_store(CountingStore())
+        try:
+            rockefeller.exchange_many(moneys, rockefeller.Currency.CLP)
+        finally:
+            rockefeller.set_exchange_rates_store(store)
+
+        assert calls == [(rockefeller.Currency.USD, rockefeller.Currency.CLP)]
+
+    def test_exchange_many_indirectional(self):
+        moneys = [rockefeller.Money(100, rockefeller.Currency.EUR)]
+
+        result = rockefeller.exchange_many(
+            moneys, rockefeller.Currency.CLP,
+            indirection_currency=rockefeller.Currency.USD)
+        assert result == [rockefeller.Money(60551, rockefeller.Currency.CLP)]
+
+    def test_exchange_many_not_set(self):
+        rockefeller.Money.indirection_currency = None
+        moneys = [rockefeller.Money(100, rockefeller.Currency.EUR)]
+
+        with pytest.raises(rockefeller.exceptions.ExchangeError):
+            rockefeller.exchange_many(moneys, rockefeller.Currency.CLP)
+
+
+class TestAggregation:
+    def test_sum_money(self):
+        usd = rockefeller.Currency.USD
+        moneys = [rockefeller.Money('10.5', usd), rockefeller.Money(2, usd)]
+
+        assert rockefeller.sum_money(moneys) == rockefeller.Money('12.5', usd)
+        assert rockefeller.sum_money(iter(moneys), usd) == \
+            rockefeller.Money('12.5', usd)
+
+    def test_sum_money_empty(self):
+        usd = rockefeller.Currency.USD
+
+        assert rockefeller.sum_money([], usd) == rockefeller.Money(0, usd)
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.sum_money([])
+
+    def test_sum_money_different_currencies(self):
+        moneys = [rockefeller.Money(1, rockefeller.Currency.USD),
+                  rockefeller.Money(1, rockefeller.Currency.EUR)]
+
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.sum_money(moneys)
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.sum_money(moneys[:1], rockefeller.Currency.EUR)
+
+    def test_sum_money_wrong_type(self):
+        with pytest.raises(TypeError):
+            rockefeller.sum_money([decimal.Decimal(1)])
+
+    def test_sum_fixed_money(self):
+        usd = rockefeller.Currency.USD
+        fixed = [rockefeller.FixedMoney('0.10', usd)] * 3
+
+        total = rockefeller.sum_money(fixed)
+        assert isinstance(total, rockefeller.FixedMoney)
+        assert total.units == 30
+
+        total = rockefeller.sum_money(fixed + [rockefeller.Money('0.005', usd)])
+        assert isinstance(total, rockefeller.Money)
+        assert total.amount == decimal.Decimal('0.305')
+
+    def test_totals_by_currency(self):
+        usd = rockefeller.Currency.USD
+        eur = rockefeller.Currency.EUR
+        moneys = [rockefeller.Money(1, eur), rockefeller.Money(2, usd),
+                  rockefeller.Money(3, eur)]
+
+        totals = rockefeller.totals_by_currency(moneys)
+
+        assert list(totals.items()) == [(eur, rockefeller.Money(4, eur)),
+                                        (usd, rockefeller.Money(2, usd))]
+        assert rockefeller.totals_by_currency([]) == {}
+
+    def test_total_in(self):
+        usd = rockefeller.Currency.USD
+        eur = rockefeller.Currency.EUR
+        moneys = [rockefeller.Money(100, usd), rockefeller.Money(1, eur),
+                  rockefeller.FixedMoney('0.50', usd)]
+
+        total = rockefeller.total_in(moneys, eur)
+
+        assert total == rockefeller.Money('79.39', eur)
+
+    def test_total_in_rounds_once(self):
+        usd = rockefeller.Currency.USD
+        moneys = [rockefeller.Money('0.01', usd)] * 3
+
+        assert rockefeller.total_in(moneys, rockefeller.Currency.EUR) == \
+            rockefeller.Money('0.02', rockefeller.Currency.EUR)
+
+    def test_total_in_rate_looked_up_once(self):
+        moneys = [rockefeller.Money(i, rockefeller.Currency.USD)
+                  for i in range(10)]
+        store = rockefeller.exchange_rates.store
+        calls = []
+
+        class CountingStore(object):
+            def get_exchange_rate(self, base_currency, currency):
+                calls.append((base_currency, currency))
+                return store.get_exchange_rate(base_currency, currency)
+
+        with rockefeller.using_rates(CountingStore()):
+            total = rockefeller.total_in(moneys, rockefeller.Currency.CLP)
+
+        assert total == rockefeller.Money(21254, rockefeller.Currency.CLP)
+        assert calls == [(rockefeller.Currency.USD, rockefeller.Currency.CLP)]
+
+    def test_total_in_not_set(self):
+        rockefeller.Money.indirection_currency = None
+        moneys = [rockefeller.Money(100, rockefeller.Currency.EUR)]
+
+        with pytest.raises(rockefeller.exceptions.ExchangeError):
+            rockefeller.total_in(moneys, rockefeller.Currency.CLP)
+
+
+class TestAllocate:
+    def test_split(self):
+        usd = rockefeller.Currency.USD
+        parts = rockefeller.split(rockefeller.Money(100, usd), 3)
+
+        assert parts == [rockefeller.Money('33.34', usd),
+                         rockefeller.Money('33.33', usd),
+                         rockefeller.Money('33.33', usd)]
+
+    def test_split_negative(self):
+        clp = rockefeller.Currency.CLP
+        parts = rockefeller.split(rockefeller.Money(-5, clp), 3)
+
+        assert parts == [rockefeller.Money(-2, clp), rockefeller.Money(-2, clp),
+                         rockefeller.Money(-1, clp)]
+
+    def test_split_invalid(self):
+        with pytest.raises(ValueError):
+            rockefeller.split(rockefeller.Money(1, rockefeller.Currency.USD), 0)
+        with pytest.raises(TypeError):
+            rockefeller.split(rockefeller.Money(1, rockefeller.Currency.USD),
+                              2.5)
+
+    def test_allocate_largest_remainder(self):
+        usd = rockefeller.Currency.USD
+        parts = rockefeller.allocate(rockefeller.Money('0.05', usd), [1, 3])
+
+        # 1.25 and 3.75 cents: the second part has the largest remainder.
+        assert parts == [rockefeller.Money('0.01', usd),
+                         rockefeller.Money('0.04', usd)]
+
+    def test_allocate_ties(self):
+        usd = rockefeller.Currency.USD
+        parts = rockefeller.allocate(rockefeller.Money('0.05', usd), [3, 7])
+
+        assert parts == [rockefeller.Money('0.02', usd),
+                         rockefeller.Money('0.03', usd)]
+
+    def test_allocate_decimal_ratios(self):
+        usd = rockefeller.Currency.USD
+        parts = rockefeller.allocate(rockefeller.Money(10, usd),
+                                     ['0.21', 1, 0])
+
+        assert parts == [rockefeller.Money('1.74', usd),
+                         rockefeller.Money('8.26', usd),
+                         rockefeller.Money(0, usd)]
+        assert rockefeller.sum_money(parts) == rockefeller.Money(10, usd)
+
+    def test_allocate_fixed_money(self):
+        usd = rockefeller.Currency.USD
+        parts = rockefeller.allocate(rockefeller.FixedMoney(1, usd), [1, 1, 1])
+
+        assert [part.units for part in parts] == [34, 33, 33]
+        assert all(isinstance(part, rockefeller.FixedMoney) for part in parts)
+
+    def test_allocate_inexact_amount(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.allocate(
+                rockefeller.Money('0.005', rockefeller.Currency.USD), [1, 1])
+
+    def test_allocate_invalid_ratios(self):
+        money = rockefeller.Money(1, rockefeller.Currency.USD)
+
+        for ratios in ([], [0, 0], [1, -1], [1, 'Infinity'], ['NaN']):
+            with pytest.raises(ValueError):
+                rockefeller.allocate(money, ratios)
+
+
+class TestFixedMoney:
+    def test_units(self):
+        usd = rockefeller.FixedMoney('100.25', rockefeller.Currency.USD)
+
+        assert 10025 == usd.units
+        assert decimal.Decimal('100.25') == usd.amount
+
+    def test_inexact_amount(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.FixedMoney('100.255', rockefeller.Currency.USD)
+
+    def test_invalid_currency(self):
+        with pytest.raises(rockefeller.MoneyError):
+            rockefeller.FixedMoney(100, None)
+
+    def test_from_units(self):
+        clp = rockefeller.FixedMoney.from_units(60551, rockefeller.Currency.CLP)
+
+        assert rockefeller.FixedMoney(60551, rockefeller.Currency.CLP) == clp
+
+    def test_money_interoperability(self):
+        money = rockefeller.Money('1.5', rockefeller.Currency.USD)
+        fixed = rockefeller.FixedMoney.from_money(money)
+
+        assert fixed == money
+        assert money == fixed
+        assert fixed.to_money() == money
+        assert money + fixed == rockefeller.Money(3, rockefeller.Currency.USD)
+        assert fixed + money == rockefeller.Money(3, rockefeller.Currency.USD)
+        assert isinstance(fixed + money, rockefeller.Money)
+
+    def test_hash_money(self):
+        money = rockefeller.Money('1.50', rockefeller.Currency.USD)
+        fixed = rockefeller.FixedMoney.from_money(money)
+
+        assert hash(fixed) == hash(money)
+        assert len(set([money, fixed])) == 1
+        assert not money != fixed
+
+    def test_addition(self):
+        usd1 = rockefeller.FixedMoney('0.10', rockefeller.Currency.USD)
+        usd2 = rockefeller.FixedMoney('0.20', rockefeller.Currency.USD)
+
+        assert rockefeller.FixedMoney('0.30', rockefeller.Currency.USD) == \
+            usd1 + usd2
+        assert isinstance(usd1 + usd2, rockefeller.FixedMoney)
+
+    def test_substraction(self):
+        usd1 = rockefeller.FixedMoney(90, rockefeller.Currency.USD)
+        usd2 = rockefeller.FixedMoney(100, rockefeller.Currency.USD)
+
+        assert rockefeller.FixedMoney(-10, rockefeller.Currency.USD) == \
+            usd1 - usd2
+
+    def test_different_currencies(self):
+        usd = rockefeller.FixedMoney(1, rockefeller.Currency.USD)
+        eur = rockefeller.FixedMoney(1, rockefeller.Currency.EUR)
+
+        with pytest.raises(rockefeller.MoneyError):
+            usd + eur
+
+    def test_unsupported_addition(self):
+        usd = rockefeller.FixedMoney(1, rockefeller.Currency.USD)
+
+        with pytest.raises(TypeError):
+            usd + 100
+
+    def test_multiplication(self):
+        usd = rockefeller.FixedMoney('1.50', rockefeller.Currency.USD)
+        money = rockefeller.Money(2, rockefeller.Currency.USD)
+
+        assert rockefeller.Money(3, rockefeller.Currency.USD) == usd * money
+        assert rockefeller.Money(3, rockefeller.Currency.USD) == money * usd
+
+    def test_unsupported_multiplication(self):
+        usd = rockefeller.FixedMoney('1.50', rockefeller.Currency.USD)
+
+        with pytest.raises(TypeError):
+            usd * 3
+        with pytest.raises(TypeError):
+            3 * usd
+
+    def test_comparison(self):
+        usd1 = rockefeller.FixedMoney(90, rockefeller.Currency.USD)
+        usd2 = rockefeller.FixedMoney(100, rockefeller.Currency.USD)
+
+        assert usd1 < usd2
+        assert usd1 <= usd2
+        assert usd2 > usd1
+        assert usd2 >= rockefeller.Money(100, rockefeller.Currency.USD)
+        assert usd1 != usd2
+
+    def test_exchange_to(self):
+        usd = rockefeller.FixedMoney(100, rockefeller.Currency.USD)
+
+        exchange = usd.exchange_to(rockefeller.Currency.EUR)
+        assert rockefeller.FixedMoney(78, rockefeller.Currency.EUR) == exchange
+        assert isinstance(exchange, rockefeller.FixedMoney)
+
+    def test_representation(self):
+        usd = rockefeller.FixedMoney(100, rockefeller.Currency.USD)
+
+        if PY3:
+            assert '$100' == str(usd)
+        else:
+            assert u'$100' == unicode(usd)
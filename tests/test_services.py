@@ -1,9 +1,25 @@
 # -*- coding: utf-8 -*-
+import datetime
 import decimal
+import io
+import json
+import threading
 
 import mock
+import pytest
 
-from rockefeller.services import OpenExchangeRates
+try:
+    from urllib.error import HTTPError
+except ImportError:
+    from urllib2 import HTTPError
+
+from rockefeller.openers import DefaultOpener, NOT_MODIFIED
+from rockefeller.services import (OpenExchangeRates, DiskCache, ServiceError,
+                                  RateRefresher)
+
+
+def stream(rates):
+    return io.BytesIO(json.dumps(rates).encode('utf-8'))
 
 
 class TestOpenExchangeRates:
@@ -42,3 +58,287 @@ class TestOpenExchangeRates:
         assert usd_clp.code_from == 'USD'
         assert usd_clp.code_to == 'EUR'
         assert usd_clp.rate == decimal.Decimal('0.78')
+
+    def test_latest_not_modified(self):
+        s = OpenExchangeRates(app_id='123', conditional=True)
+        s.url_opener = mock.Mock()
+        s.url_opener.open.return_value = NOT_MODIFIED
+
+        results = s.latest()
+
+        assert results.modified is False
+        assert list(results) == []
+        assert s.url_opener.open.call_args[1] == {'conditional': True}
+
+    def test_latest_modified(self):
+        s = OpenExchangeRates(app_id='123', conditional=True)
+        s.url_opener = mock.Mock()
+        s.url_opener.open.return_value = {'base': 'USD',
+                                          'rates': {'EUR': '0.78'}}
+
+        results = s.latest()
+
+        assert results.modified is True
+        assert len(list(results)) == 1
+
+    def test_conditional_clients_own_validators(self):
+        first = OpenExchangeRates(app_id='123', conditional=True)
+        second = OpenExchangeRates(app_id='123', conditional=True)
+
+        assert first.url_opener is not second.url_opener
+        assert isinstance(first.url_opener, DefaultOpener)
+        assert OpenExchangeRates(app_id='123').url_opener is \
+            OpenExchangeRates.url_opener
+
+        first.url_opener.remember(first.get_url('latest'), {'ETag': '"abc"'})
+        assert second.url_opener.get_conditional_headers(
+            second.get_url('latest')) == {}
+
+    def test_historical(self):
+        s = OpenExchangeRates(app_id='123')
+        s.url_opener.open = mock.Mock(
+            return_value={'base': 'USD', 'rates': {'EUR': '0.78'}})
+
+        usd_eur, = list(s.historical(datetime.date(2013, 3, 30)))
+
+        assert usd_eur.rate == decimal.Decimal('0.78')
+        url, params = s.url_opener.open.call_args[0]
+        assert url.endswith('/historical/2013-03-30.json')
+        assert params == {'app_id': '123'}
+
+    def test_historical_error(self):
+        s = OpenExchangeRates(app_id='123')
+        s.url_opener.open = mock.Mock(
+            return_value={'error': True, 'description': 'Not found'})
+
+        with pytest.raises(ServiceError):
+            s.historical('2013-03-30')
+
+    def test_historical_cached(self, tmpdir):
+        cache = DiskCache(str(tmpdir.join('rates')))
+        s = OpenExchangeRates(app_id='123', cache=cache)
+        s.url_opener.open = mock.Mock(
+            return_value={'base': 'USD', 'rates': {'EUR': 0.78}})
+
+        first = list(s.historical(datetime.date(2013, 3, 30)))
+        second = list(s.historical(datetime.date(2013, 3, 30)))
+
+        assert first == second
+        assert s.url_opener.open.call_count == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_historical_cache_params(self, tmpdir):
+        cache = DiskCache(str(tmpdir))
+        s = OpenExchangeRates(app_id='123', cache=cache)
+        s.url_opener.open = mock.Mock(
+            return_value={'base': 'USD', 'rates': {'EUR': 0.78}})
+
+        s.historical('2013-03-30')
+        s.historical('2013-03-30', base='EUR')
+
+        assert s.url_opener.open.call_count == 2
+        assert len(tmpdir.listdir()) == 2
+
+    def test_historical_range(self, tmpdir):
+        s = OpenExchangeRates(app_id='123', cache=DiskCache(str(tmpdir)))
+        s.url_opener.open = mock.Mock(
+            return_value={'base': 'USD', 'rates': {'EUR': 0.78}})
+
+        dates = [date for date, _ in s.historical_range(
+            datetime.date(2013, 2, 27), datetime.date(2013, 3, 2))]
+        list(s.historical_range(datetime.date(2013, 2, 27),
+                                datetime.date(2013, 3, 2)))
+
+        assert dates == [datetime.date(2013, 2, 27), datetime.date(2013, 2, 28),
+                         datetime.date(2013, 3, 1), datetime.date(2013, 3, 2)]
+        assert s.url_opener.open.call_count == 4
+        assert s.cache.hits == 4
+
+    def test_historical_cache_decimal(self, tmpdir):
+        s = OpenExchangeRates(app_id='123', cache=DiskCache(str(tmpdir)))
+        s.url_opener.open = mock.Mock(return_value={
+            'base': 'USD', 'rates': {'EUR': decimal.Decimal('0.780000001')}})
+
+        s.historical('2013-03-30')
+        usd_eur, = list(s.historical('2013-03-30'))
+
+        assert usd_eur.rate == decimal.Decimal('0.780000001')
+
+    def test_stream(self):
+        s = OpenExchangeRates(app_id='123')
+        s.url_opener.open_stream = mock.Mock(return_value=stream(
+            {'disclaimer': '', 'base': 'USD', 'rates': {'EUR': 0.78}}))
+
+        usd_eur, = list(s.stream('latest'))
+
+        assert usd_eur.code_from == 'USD'
+        assert usd_eur.code_to == 'EUR'
+        assert usd_eur.rate == decimal.Decimal('0.78')
+
+    def test_stream_rates_before_base(self):
+        s = OpenExchangeRates(app_id='123')
+        s.url_opener.open_stream = mock.Mock(return_value=io.BytesIO(
+            b'{"rates": {"EUR": 0.78}, "base": "USD"}'))
+
+        usd_eur, = list(s.stream('latest'))
+
+        assert usd_eur.code_from == 'USD'
+
+    def test_stream_error(self):
+        s = OpenExchangeRates(app_id='123')
+        s.url_opener.open_stream = mock.Mock(return_value=stream(
+            {'error': True, 'status': 401, 'description': 'Invalid App ID'}))
+
+        with pytest.raises(ServiceError) as e:
+            list(s.stream('latest'))
+        assert 'Invalid App ID' in str(e.value)
+
+    def test_time_series(self):
+        s = OpenExchangeRates(app_id='123')
+        s.url_opener.open_stream = mock.Mock(return_value=stream(
+            {'base': 'USD', 'rates': {'2013-01-01': {'EUR': 0.75},
+                                      '2013-01-02': {'EUR': 0.76}}}))
+
+        rates = sorted(s.time_series(datetime.date(2013, 1, 1),
+                                     '2013-01-02').iter_dated())
+
+        assert [(date, rate.rate) for date, rate in rates] == [
+            ('2013-01-01', decimal.Decimal('0.75')),
+            ('2013-01-02', decimal.Decimal('0.76'))]
+        url, params = s.url_opener.open_stream.call_args[0]
+        assert url.endswith('/time-series.json')
+        assert params == {'app_id': '123', 'start': '2013-01-01',
+                          'end': '2013-01-02'}
+
+
+class TestDiskCache:
+    def test_set_replaces(self, tmpdir):
+        cache = DiskCache(str(tmpdir))
+        cache.set('2013-03-30', {}, {'rates': {'EUR': 0.78}})
+        cache.set('2013-03-30', {}, {'rates': {'EUR': 0.79}})
+
+        assert cache.get('2013-03-30', {}) == {
+            'rates': {'EUR': decimal.Decimal('0.79')}}
+        assert len(tmpdir.listdir()) == 1
+
+    def test_set_error_cleans_up(self, tmpdir):
+        cache = DiskCache(str(tmpdir))
+
+        with mock.patch('json.dump', side_effect=ValueError):
+            with pytest.raises(ValueError):
+                cache.set('2013-03-30', {}, {'rates': {}})
+        assert tmpdir.listdir() == []
+
+
+class TestDefaultOpener:
+    def test_open_decimal(self):
+        opener = DefaultOpener()
+        opener.open_stream = mock.Mock(return_value=stream(
+            {'base': 'USD', 'rates': {'EUR': 0.78}}))
+
+        rates = opener.open('http://example.com', {})
+
+        assert rates['rates']['EUR'] == decimal.Decimal('0.78')
+
+    def test_conditional_request(self):
+        response = stream({'base': 'USD', 'rates': {}})
+        response.headers = {'ETag': '"abc"',
+                            'Last-Modified': 'Sat, 30 Mar 2013 00:00:00 GMT'}
+        opener = DefaultOpener()
+        opener.opener = mock.Mock()
+        opener.opener.open.return_value = response
+
+        assert opener.open('http://example.com', {}, conditional=True) == {
+            'base': 'USD', 'rates': {}}
+        request = opener.opener.open.call_args[0][0]
+        assert request.get_header('If-none-match') is None
+
+        opener.opener.open.side_effect = HTTPError(
+            request.get_full_url(), 304, 'Not Modified', {}, None)
+        assert opener.open('http://example.com', {},
+                           conditional=True) is NOT_MODIFIED
+        request = opener.opener.open.call_args[0][0]
+        assert request.get_header('If-none-match') == '"abc"'
+        assert request.get_header('If-modified-since') == (
+            'Sat, 30 Mar 2013 00:00:00 GMT')
+
+    def test_unconditional_request(self):
+        responses = [stream({'base': 'USD', 'rates': {}}) for _ in range(2)]
+        for response in responses:
+            response.headers = {'ETag': '"abc"'}
+        opener = DefaultOpener()
+        opener.opener = mock.Mock()
+        opener.opener.open.side_effect = responses
+
+        opener.open('http://example.com', {})
+        opener.open('http://example.com', {})
+
+        request = opener.opener.open.call_args[0][0]
+        assert request.get_header('If-none-match') is None
+
+
+class TestRateRefresher:
+    def setup_method(self, method):
+        self.service = mock.Mock()
+        self.service.latest.return_value = OpenExchangeRates.Results(
+            {'base': 'USD', 'rates': {'EUR': decimal.Decimal('0.78')}})
+        self.installed = []
+
+    def test_refresh(self):
+        refresher = RateRefresher(self.service, install=self.installed.append,
+                                  base='USD')
+
+        assert refresher.refresh() is True
+
+        self.service.latest.assert_called_once_with(base='USD')
+        store, = self.installed
+        assert store is refresher.store
+        assert store.codes == ['USD', 'EUR']
+
+    def test_refresh_not_modified(self):
+        self.service.latest.return_value = OpenExchangeRates.Results(
+            None, modified=False)
+        refresher = RateRefresher(self.service, install=self.installed.append)
+
+        assert refresher.refresh() is False
+        assert self.installed == []
+
+    def test_default_install(self):
+        import rockefeller
+        previous = rockefeller.exchange_rates.store
+        try:
+            RateRefresher(self.service).refresh()
+            assert isinstance(rockefeller.exchange_rates.store,
+                              rockefeller.RateMatrix)
+        finally:
+            rockefeller.set_exchange_rates_store(previous)
+
+    def test_background_thread(self):
+        refreshed = threading.Event()
+
+        def install(store):
+            self.installed.append(store)
+            if len(self.installed) == 2:
+                refreshed.set()
+
+        refresher = RateRefresher(self.service, interval=0.01,
+                                  install=install)
+        refresher.start()
+        try:
+            assert refreshed.wait(5)
+        finally:
+            refresher.stop(5)
+        assert refresher.thread is None
+        assert self.installed[0] is not self.installed[1]
+
+    def test_errors_kept(self):
+        self.service.latest.side_effect = ServiceError('Invalid app_id')
+        refresher = RateRefresher(self.service, interval=5,
+                                  install=self.installed.append)
+        with mock.patch.object(refresher.stopped, 'wait',
+                               side_effect=lambda timeout: refresher.stop()):
+            refresher.run()
+
+        assert isinstance(refresher.last_error, ServiceError)
+        assert self.installed == []
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
-from rockefeller.utils import LoggingHandler
+import decimal
+
+from rockefeller.utils import (LoggingHandler, get_decimal_context,
+                               set_decimal_context, reset_decimal_context)
 
 
 class TestLoggingHandler:
@@ -10,3 +13,31 @@ class TestLoggingHandler:
     def test_logger_default_name(self):
         h = LoggingHandler()
         assert 'rockefeller.utils' == h.logger.name
+
+
+class TestDecimalContext:
+    def teardown_method(self, method):
+        reset_decimal_context()
+
+    def test_defaults(self):
+        context = get_decimal_context()
+
+        assert context.prec == 28
+        assert context.rounding == decimal.ROUND_HALF_EVEN
+        assert context.traps[decimal.DivisionByZero]
+
+    def test_set_decimal_context(self):
+        set_decimal_context(prec=6)
+        set_decimal_context(rounding=decimal.ROUND_DOWN)
+
+        context = get_decimal_context()
+        assert context.prec == 6
+        assert context.rounding == decimal.ROUND_DOWN
+
+    def test_reset_decimal_context(self):
+        set_decimal_context(prec=6, rounding=decimal.ROUND_DOWN)
+        reset_decimal_context()
+
+        context = get_decimal_context()
+        assert context.prec == 28
+        assert context.rounding == decimal.ROUND_HALF_EVEN